@@ -6,15 +6,42 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import os
 import sqlite3
+import threading
+import time
 import zipfile
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 from pydantic import ValidationError
 
-from .models import ReadmeRequest, SearchResponse
+from .models import ReadmeRequest, SearchResponse, SearchResult
+
+logger = logging.getLogger(__name__)
+
+# Healthchecks poll the stats; serve a recent snapshot instead of three COUNT(*)s.
+STATS_TTL_SECONDS = 5.0
+
+# The empty-query search lists the newest cached results; keep that list this
+# long instead of re-reading and re-parsing search_cache on every request.
+RECENT_RESULTS_TTL_SECONDS = 30.0
+
+# Parsed search responses kept in process for the most recently used queries,
+# so repeat searches skip the SQLite read and the JSON parse.
+HOT_SEARCHES_MAX = 256
+
+# Applied to every connection. WAL lets readers on the worker threads proceed
+# while another thread writes; NORMAL sync is durable enough for a cache.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
 
 
 class CacheManager:
@@ -29,14 +56,66 @@ class CacheManager:
         self.packages_dir = self.cache_dir / "packages"
         self.packages_dir.mkdir(exist_ok=True)
 
-        self._connection: Optional[sqlite3.Connection] = None
+        # One connection per worker thread, created lazily by _connection
+        self._local = threading.local()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._connections_lock = threading.Lock()
+        self._db_ready = False
+        # (monotonic timestamp, stats); reset whenever a write commits
+        self._stats_cache: Optional[Tuple[float, Dict[str, int]]] = None
+        # (monotonic timestamp, limit read, results); reset when searches change
+        self._recent_cache: Optional[
+            Tuple[float, Optional[int], List[SearchResult]]
+        ] = None
+        # query_key -> (response, created_at epoch), least recently used first
+        self._hot_searches: OrderedDict[str, Tuple[SearchResponse, float]] = (
+            OrderedDict()
+        )
+        self._hot_lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection, tracking it for close()."""
+        # check_same_thread=False only so other threads may close it
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            connection.execute(pragma)
+        with self._connections_lock:
+            # Worker threads come and go; close what exited threads left behind
+            live = []
+            for thread, other in self._connections:
+                if thread.is_alive():
+                    live.append((thread, other))
+                else:
+                    other.close()
+            live.append((threading.current_thread(), connection))
+            self._connections = live
+        return connection
+
+    @property
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """This thread's connection, or None if the database is unavailable."""
+        if not self._db_ready:
+            return None
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is None:
+            try:
+                connection = self._connect()
+            except sqlite3.Error as e:
+                logger.error(f"Error opening cache database: {e}")
+                return None
+            self._local.connection = connection
+        return connection
+
     def _init_db(self) -> None:
         """Initialize the cache database with required tables."""
         try:
-            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            cursor = self._connection.cursor()
+            connection = self._connect()
+            self._local.connection = connection
+            self._db_ready = True
+            cursor = connection.cursor()
 
             # Table for search results cache
             cursor.execute(
@@ -116,12 +195,12 @@ class CacheManager:
             self._ensure_column("readme_cache", "readme_model", "TEXT")
             self._ensure_column("package_cache", "package_model", "TEXT NOT NULL DEFAULT ''")
 
-            self._connection.commit()
-            print(f"Cache database initialized at {self.db_path}")
+            connection.commit()
+            logger.info(f"Cache database initialized at {self.db_path}")
 
         except sqlite3.Error as e:
-            print(f"Database error during cache initialization: {e}")
-            self._connection = None
+            logger.error(f"Database error during cache initialization: {e}")
+            self._db_ready = False
 
     def _ensure_column(self, table: str, column: str, definition: str) -> None:
         """Add a cache metadata column if it does not exist yet."""
@@ -158,28 +237,61 @@ class CacheManager:
 
     def get_cached_search(self, query: str) -> Optional[SearchResponse]:
         """Get cached search results for a query."""
+        entry = self.get_cached_search_entry(query)
+        return entry[0] if entry else None
+
+    def get_cached_search_entry(
+        self, query: str
+    ) -> Optional[Tuple[SearchResponse, float]]:
+        """Get cached search results for a query with their creation time (epoch)."""
         if not self._connection:
             return None
 
         query_key = self._generate_query_key(query)
 
+        with self._hot_lock:
+            hot = self._hot_searches.get(query_key)
+            if hot:
+                self._hot_searches.move_to_end(query_key)
+                return hot
+
         try:
             cursor = self._connection.cursor()
             cursor.execute(
-                "SELECT results_json FROM search_cache WHERE query_key = ?",
+                """
+                SELECT results_json, CAST(strftime('%s', created_at) AS REAL)
+                FROM search_cache
+                WHERE query_key = ?
+                """,
                 (query_key,),
             )
             result = cursor.fetchone()
 
             if result:
-                results_data = json.loads(result[0])
-                return SearchResponse(**results_data)
+                response = SearchResponse.model_validate_json(result[0])
+                entry = (response, result[1] or 0.0)
+                self._remember_search(query_key, entry)
+                return entry
 
         except (sqlite3.Error, json.JSONDecodeError, ValidationError) as e:
-            print(f"Error retrieving cached search results: {e}")
+            logger.error(f"Error retrieving cached search results: {e}")
 
         return None
 
+    def _remember_search(
+        self, query_key: str, entry: Tuple[SearchResponse, float]
+    ) -> None:
+        """Keep a parsed search entry in memory, evicting the least recently used."""
+        with self._hot_lock:
+            self._hot_searches[query_key] = entry
+            self._hot_searches.move_to_end(query_key)
+            if len(self._hot_searches) > HOT_SEARCHES_MAX:
+                self._hot_searches.popitem(last=False)
+
+    def remember_search_results(self, query: str, response: SearchResponse) -> None:
+        """Serve a search from memory now, ahead of cache_search_results()."""
+        self._remember_search(self._generate_query_key(query), (response, time.time()))
+
     def cache_search_results(self, query: str, response: SearchResponse) -> None:
         """Cache search results for a query."""
         if not self._connection:
@@ -201,10 +313,13 @@ class CacheManager:
             )
 
             self._connection.commit()
-            print(f"Cached search results for query: {query}")
+            self._stats_cache = None
+            self._recent_cache = None
+            self._remember_search(query_key, (response, time.time()))
+            logger.info(f"Cached search results for query: {query}")
 
         except (sqlite3.Error, json.JSONDecodeError) as e:
-            print(f"Error caching search results: {e}")
+            logger.error(f"Error caching search results: {e}")
 
     def get_all_cached_searches(self) -> List[SearchResponse]:
         """Get all cached search results for empty/blank queries."""
@@ -221,23 +336,68 @@ class CacheManager:
             all_responses = []
             for result in results:
                 try:
-                    results_data = json.loads(result[0])
-                    response = SearchResponse(**results_data)
+                    response = SearchResponse.model_validate_json(result[0])
                     all_responses.append(response)
                 except (json.JSONDecodeError, ValidationError) as e:
-                    print(f"Error parsing cached search result: {e}")
+                    logger.error(f"Error parsing cached search result: {e}")
                     continue
 
             return all_responses
 
         except sqlite3.Error as e:
-            print(f"Error retrieving all cached searches: {e}")
+            logger.error(f"Error retrieving all cached searches: {e}")
+            return []
+
+    def get_recent_search_results(self, limit: Optional[int]) -> List[SearchResult]:
+        """Return up to limit results from the newest cached searches."""
+        if not self._connection:
             return []
 
+        cached = self._recent_cache
+        if cached and time.monotonic() - cached[0] < RECENT_RESULTS_TTL_SECONDS:
+            _, cached_limit, cached_results = cached
+            # Usable if it was read at least this far, or read every row
+            if (
+                cached_limit is None
+                or (limit is not None and limit <= cached_limit)
+                or len(cached_results) < cached_limit
+            ):
+                return cached_results[:limit]
+
+        results: List[SearchResult] = []
+        try:
+            cursor = self._connection.cursor()
+            cursor.execute(
+                "SELECT results_json FROM search_cache ORDER BY created_at DESC"
+            )
+            # Iterate the cursor lazily and stop once we have enough
+            for (results_json,) in cursor:
+                try:
+                    response = SearchResponse.model_validate_json(results_json)
+                except (json.JSONDecodeError, ValidationError) as e:
+                    logger.error(f"Error parsing cached search result: {e}")
+                    continue
+                results.extend(response.results)
+                if limit is not None and len(results) >= limit:
+                    break
+
+            self._recent_cache = (time.monotonic(), limit, results[:limit])
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving recent search results: {e}")
+
+        return results[:limit]
+
     # README caching
 
     def get_cached_readme(self, request: ReadmeRequest) -> Optional[str]:
         """Get cached README for a request."""
+        entry = self.get_cached_readme_entry(request)
+        return entry[0] if entry else None
+
+    def get_cached_readme_entry(
+        self, request: ReadmeRequest
+    ) -> Optional[Tuple[str, float]]:
+        """Get cached README for a request with its creation time (epoch)."""
         if not self._connection:
             return None
 
@@ -246,16 +406,20 @@ class CacheManager:
         try:
             cursor = self._connection.cursor()
             cursor.execute(
-                "SELECT markdown_content FROM readme_cache WHERE request_hash = ?",
+                """
+                SELECT markdown_content, CAST(strftime('%s', created_at) AS REAL)
+                FROM readme_cache
+                WHERE request_hash = ?
+                """,
                 (request_hash,),
             )
             result = cursor.fetchone()
 
             if result:
-                return cast(Optional[str], result[0])
+                return cast(str, result[0]), result[1] or 0.0
 
         except sqlite3.Error as e:
-            print(f"Error retrieving cached README: {e}")
+            logger.error(f"Error retrieving cached README: {e}")
 
         return None
 
@@ -285,6 +449,7 @@ class CacheManager:
             )
 
             self._connection.commit()
+            self._stats_cache = None
 
             # Save to file system
             package_dir = self._get_package_dir(package_name)
@@ -293,10 +458,41 @@ class CacheManager:
             readme_path = package_dir / "README.md"
             readme_path.write_text(markdown_content, encoding="utf-8")
 
-            print(f"Cached README for package: {package_name}")
+            logger.info(f"Cached README for package: {package_name}")
+
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error caching README: {e}")
+
+    def bulk_cache_readmes(self, entries: List[Tuple[ReadmeRequest, str]]) -> None:
+        """Cache many (request, markdown) READMEs in a single transaction."""
+        if not self._connection or not entries:
+            return
+
+        rows = [
+            (self._generate_readme_hash(request), request.name, markdown, None)
+            for request, markdown in entries
+        ]
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO readme_cache
+                    (request_hash, package_name, markdown_content, readme_model)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+            self._stats_cache = None
+
+            for request, markdown in entries:
+                package_dir = self._get_package_dir(request.name)
+                package_dir.mkdir(exist_ok=True)
+                (package_dir / "README.md").write_text(markdown, encoding="utf-8")
+
+            logger.info(f"Cached {len(entries)} README(s) from PyPI")
 
         except (sqlite3.Error, OSError) as e:
-            print(f"Error caching README: {e}")
+            logger.error(f"Error caching READMEs: {e}")
 
     # Convenience lookups by package name (no request hash required)
     def has_readme_by_name(self, package_name: str) -> bool:
@@ -311,7 +507,7 @@ class CacheManager:
             )
             return c.fetchone() is not None
         except sqlite3.Error as e:
-            print(f"Error checking README by name: {e}")
+            logger.error(f"Error checking README by name: {e}")
             return False
 
     def get_readme_by_name(self, package_name: str) -> Optional[str]:
@@ -333,7 +529,7 @@ class CacheManager:
             row = c.fetchone()
             return row[0] if row else None
         except sqlite3.Error as e:
-            print(f"Error fetching README by name: {e}")
+            logger.error(f"Error fetching README by name: {e}")
             return None
 
     def get_readme_metadata_by_name(self, package_name: str) -> Dict[str, Any]:
@@ -356,7 +552,7 @@ class CacheManager:
                 return {}
             return {"model": row[0] or None, "created_at": row[1]}
         except sqlite3.Error as e:
-            print(f"Error fetching README metadata by name: {e}")
+            logger.error(f"Error fetching README metadata by name: {e}")
             return {}
 
     def list_readme_packages(self) -> List[Dict[str, Any]]:
@@ -376,13 +572,18 @@ class CacheManager:
             rows = c.fetchall()
             return [{"package_name": r[0], "latest": r[1]} for r in rows]
         except sqlite3.Error as e:
-            print(f"Error listing README packages: {e}")
+            logger.error(f"Error listing README packages: {e}")
             return []
 
     # Package caching
 
     def get_cached_package(self, package_name: str) -> Optional[bytes]:
         """Get cached package ZIP bytes."""
+        zip_path = self.get_cached_package_path(package_name)
+        return zip_path.read_bytes() if zip_path else None
+
+    def get_cached_package_path(self, package_name: str) -> Optional[Path]:
+        """Get the path of the cached package ZIP, if it still exists."""
         if not self._connection:
             return None
 
@@ -397,16 +598,17 @@ class CacheManager:
             if result:
                 zip_path = Path(result[0])
                 if zip_path.exists():
-                    return zip_path.read_bytes()
+                    return zip_path
                 # Clean up stale database entry
                 cursor.execute(
                     "DELETE FROM package_cache WHERE package_name = ?",
                     (package_name,),
                 )
                 self._connection.commit()
+                self._stats_cache = None
 
         except sqlite3.Error as e:
-            print(f"Error retrieving cached package: {e}")
+            logger.error(f"Error retrieving cached package: {e}")
 
         return None
 
@@ -425,7 +627,7 @@ class CacheManager:
                 return False
             return Path(row[0]).exists()
         except sqlite3.Error as e:
-            print(f"Error checking package by name: {e}")
+            logger.error(f"Error checking package by name: {e}")
             return False
 
     # --- Search history ---
@@ -454,7 +656,7 @@ class CacheManager:
                 out.append({"query": q, "count": count, "created_at": ts})
             return out
         except sqlite3.Error as e:
-            print(f"Error retrieving search history: {e}")
+            logger.error(f"Error retrieving search history: {e}")
             return []
 
     def cache_package(
@@ -484,10 +686,42 @@ class CacheManager:
             )
 
             self._connection.commit()
-            print(f"Cached package ZIP for: {package_name}")
+            self._stats_cache = None
+            logger.info(f"Cached package ZIP for: {package_name}")
 
         except (sqlite3.Error, OSError) as e:
-            print(f"Error caching package: {e}")
+            logger.error(f"Error caching package: {e}")
+
+    def cache_package_file(
+        self, package_name: str, zip_file: Path, model_used: Optional[str] = None
+    ) -> Path:
+        """Move a finished package ZIP into the cache and record it."""
+        package_dir = self._get_package_dir(package_name)
+        zip_path = package_dir / f"{package_name}.zip"
+        try:
+            package_dir.mkdir(exist_ok=True)
+            os.replace(zip_file, zip_path)
+        except OSError as e:
+            logger.error(f"Error caching package: {e}")
+            return zip_file
+
+        if self._connection:
+            try:
+                cursor = self._connection.cursor()
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO package_cache
+                    (package_name, zip_path, package_model)
+                    VALUES (?, ?, ?)
+                    """,
+                    (package_name, str(zip_path), model_used or ""),
+                )
+                self._connection.commit()
+                self._stats_cache = None
+                logger.info(f"Cached package ZIP for: {package_name}")
+            except sqlite3.Error as e:
+                logger.error(f"Error caching package: {e}")
+        return zip_path
 
     def get_package_metadata_by_name(self, package_name: str) -> Dict[str, Any]:
         """Return metadata for a cached package ZIP by package name."""
@@ -509,9 +743,57 @@ class CacheManager:
                 return {}
             return {"model": row[0] or None, "created_at": row[1]}
         except sqlite3.Error as e:
-            print(f"Error fetching package metadata by name: {e}")
+            logger.error(f"Error fetching package metadata by name: {e}")
             return {}
 
+    def batch_availability(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return README/package cache status for many names in two queries."""
+        status: Dict[str, Dict[str, Any]] = {
+            name: {
+                "readme_cached": False,
+                "package_cached": False,
+                "readme_model": None,
+                "package_model": None,
+            }
+            for name in names
+        }
+        if not self._connection or not status:
+            return status
+        try:
+            c = self._connection.cursor()
+            unique = list(status)
+            # Stay well below SQLite's host-parameter limit on old builds (999).
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                # Oldest first, so the newest README's model wins.
+                c.execute(
+                    f"""
+                    SELECT package_name, readme_model
+                    FROM readme_cache
+                    WHERE package_name IN ({placeholders})
+                    ORDER BY datetime(created_at)
+                    """,
+                    chunk,
+                )
+                for name, model in c.fetchall():
+                    status[name]["readme_cached"] = True
+                    status[name]["readme_model"] = model or None
+                c.execute(
+                    f"""
+                    SELECT package_name, zip_path, package_model
+                    FROM package_cache
+                    WHERE package_name IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                for name, zip_path, model in c.fetchall():
+                    status[name]["package_cached"] = Path(zip_path).exists()
+                    status[name]["package_model"] = model or None
+        except sqlite3.Error as e:
+            logger.error(f"Error checking availability: {e}")
+        return status
+
     def generate_stub_package(
         self, package_name: str, metadata: Optional[Dict[str, Any]] = None
     ) -> bytes:
@@ -657,16 +939,25 @@ SOFTWARE.
                 cursor.execute("DELETE FROM package_cache")
 
             self._connection.commit()
-            print(f"Cleared {cache_type or 'all'} cache(s)")
+            self._stats_cache = None
+            if cache_type == "search" or cache_type is None:
+                self._recent_cache = None
+                with self._hot_lock:
+                    self._hot_searches.clear()
+            logger.info(f"Cleared {cache_type or 'all'} cache(s)")
 
         except sqlite3.Error as e:
-            print(f"Error clearing cache: {e}")
+            logger.error(f"Error clearing cache: {e}")
 
     def get_cache_stats(self) -> Dict[str, int]:
-        """Get cache statistics."""
+        """Get cache statistics, cached for STATS_TTL_SECONDS."""
         if not self._connection:
             return {"search": 0, "readme": 0, "package": 0}
 
+        cached = self._stats_cache
+        if cached and time.monotonic() - cached[0] < STATS_TTL_SECONDS:
+            return dict(cached[1])
+
         try:
             cursor = self._connection.cursor()
 
@@ -679,21 +970,26 @@ SOFTWARE.
             cursor.execute("SELECT COUNT(*) FROM package_cache")
             package_count = cursor.fetchone()[0]
 
-            return {
+            stats = {
                 "search": search_count,
                 "readme": readme_count,
                 "package": package_count,
             }
+            self._stats_cache = (time.monotonic(), stats)
+            return dict(stats)
 
         except sqlite3.Error as e:
-            print(f"Error getting cache stats: {e}")
+            logger.error(f"Error getting cache stats: {e}")
             return {"search": 0, "readme": 0, "package": 0}
 
     def close(self) -> None:
-        """Close database connection."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Close the database connections of all threads."""
+        self._db_ready = False
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for _, connection in connections:
+            connection.close()
+        self._local = threading.local()
 
 
 # Global cache manager instance
@@ -7,6 +7,7 @@ Handles structured formats and simple retry workflows.
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass
 from threading import Lock
 import time
@@ -18,6 +19,8 @@ from openai import OpenAI
 from .config import config
 from .logger import llm_logger
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class ChatCompletionResult:
@@ -280,7 +283,7 @@ class OpenRouterClientBase:
     # -----------------
     def ask_llm_to_fix_json(self, broken_json: str) -> Optional[str]:
         """Makes a one-shot request to the LLM to fix a broken JSON string."""
-        print("--- Attempting one-shot LLM call to fix JSON ---")
+        logger.warning("--- Attempting one-shot LLM call to fix JSON ---")
         try:
             response = self.create_chat_completion(
                 messages=[
@@ -302,7 +305,7 @@ class OpenRouterClientBase:
             )
             return fixed_content
         except Exception as e:
-            print(f"Error during LLM JSON fix attempt: {e}")
+            logger.error(f"Error during LLM JSON fix attempt: {e}")
             llm_logger.error(f"Error during LLM JSON fix attempt: {e}")
             return None
 
@@ -378,18 +381,18 @@ class OpenRouterClientBase:
         try:
             return cast(dict[str, Any], json.loads(s))
         except json.JSONDecodeError as e:
-            print(f"Initial JSON decode failed: {e}. Attempting repairs...")
+            logger.warning(f"Initial JSON decode failed: {e}. Attempting repairs...")
             llm_logger.warning(f"Initial JSON decode failed: {e}. Raw content:\n{s}")
 
         # 3. Second attempt: Use untruncate_json for common truncation issues
         try:
             repaired_s = untruncate_json.complete(s)
             data = json.loads(repaired_s)
-            print("Successfully repaired JSON with `untruncate_json`.")
+            logger.info("Successfully repaired JSON with `untruncate_json`.")
             llm_logger.info("Successfully repaired JSON with `untruncate_json`.")
             return cast(dict[str, Any], data)
         except (json.JSONDecodeError, Exception) as e:
-            print(f"`untruncate_json` failed: {e}. Attempting LLM-based fix.")
+            logger.warning(f"`untruncate_json` failed: {e}. Attempting LLM-based fix.")
             llm_logger.warning(f"`untruncate_json` failed: {e}.")
 
         # 4. Third attempt: One-shot call to the LLM to fix the JSON
@@ -407,11 +410,11 @@ class OpenRouterClientBase:
                         )
                     repaired = first_document
                 data = json.loads(repaired)
-                print("Successfully repaired JSON with a one-shot LLM call.")
+                logger.info("Successfully repaired JSON with a one-shot LLM call.")
                 llm_logger.info("Successfully repaired JSON with a one-shot LLM call.")
                 return cast(dict[str, Any], data)
             except json.JSONDecodeError as e:
-                print(f"LLM-repaired JSON is still invalid: {e}")
+                logger.error(f"LLM-repaired JSON is still invalid: {e}")
                 llm_logger.error(
                     f"LLM-repaired JSON is still invalid: {e}\nRepaired content:\n{fixed_json_str}"
                 )
@@ -8,6 +8,7 @@ OpenRouter AI client for generating PyPI-style search results and READMEs.
 from __future__ import annotations
 
 import json
+import logging
 import random
 from typing import Any, List, Optional
 
@@ -18,6 +19,8 @@ from .config import config
 from .logger import llm_logger  # <--- IMPORT THE NEW LOGGER
 from .models import ReadmeRequest
 
+logger = logging.getLogger(__name__)
+
 
 class OpenRouterClientReadMe:
     """Client for interacting with OpenRouter AI service via OpenAI interface."""
@@ -72,7 +75,7 @@ class OpenRouterClientReadMe:
             return self._render_readme_markdown(data)
 
         except Exception as e:
-            print(f"Error generating README via OpenRouter: {e}")
+            logger.error(f"Error generating README via OpenRouter: {e}")
             llm_logger.error(
                 f"Error generating README via OpenRouter for '{req.name}': {e}"
             )
@@ -156,7 +159,7 @@ class OpenRouterClientReadMe:
             return s.strip() + ("\n" if not s.endswith("\n") else ""), response.model_used
 
         except Exception as e:
-            print(f"Error generating README (markdown) via OpenRouter: {e}")
+            logger.error(f"Error generating README (markdown) via OpenRouter: {e}")
             llm_logger.error(
                 f"Error generating README (markdown) via OpenRouter for '{req.name}': {e}"
             )
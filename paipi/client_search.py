@@ -278,10 +278,10 @@ class OpenRouterClientSearch:
 
                         normalized_item = dict(item)
                         normalized_item["name"] = requested_name
-                        result = SearchResult(**normalized_item)
                         # Mark as non-existent but with generated data
-                        result.package_exists = False
-                        result.search_model = response.model_used
+                        normalized_item["package_exists"] = False
+                        normalized_item["search_model"] = response.model_used
+                        result = SearchResult(**normalized_item)
                         generated_results[requested_name] = result
                     except Exception as e:
                         llm_logger.warning(
@@ -7,16 +7,22 @@ to generate Python libraries based on PyPI descriptions and README specification
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import logging
+import os
 import re
 import shutil
 import subprocess
+import sys
 import tempfile
+import threading
 import time
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from jinja2 import ChoiceLoader, Environment, FileSystemLoader, StrictUndefined
 
@@ -27,6 +33,21 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _docker_version() -> str:
+    """
+    Return the installed Docker version string.
+
+    The result is memoized for the life of the process so that constructing a
+    DockerOpenInterpreter per request does not fork the docker CLI each time.
+    Failures raise and are therefore not cached.
+    """
+    result = subprocess.run(
+        ["docker", "--version"], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
 @dataclass
 class GenerationConfig:
     """Configuration for library generation"""
@@ -79,16 +100,14 @@ class DockerOpenInterpreter:
     def _validate_docker(self) -> None:
         """Validate that Docker is installed and running"""
         try:
-            result = subprocess.run(
-                ["docker", "--version"], capture_output=True, text=True, check=True
-            )
-            self.logger.info(f"Docker found: {result.stdout.strip()}")
+            self.logger.info(f"Docker found: {_docker_version()}")
         except (subprocess.CalledProcessError, FileNotFoundError) as some_error:
             raise RuntimeError("Docker is not installed or not running") from some_error
 
     def _create_dockerfile(self, work_dir: Path, python_version: str) -> None:
         """Create a Dockerfile for the Open Interpreter container"""
         dockerfile_content = f"""
+# syntax=docker/dockerfile:1.6
 FROM python:{python_version}-slim
 
 # Install system dependencies
@@ -101,8 +120,9 @@ RUN apt-get update && apt-get install -y \\
 # Set working directory
 WORKDIR /workspace
 
-# Install Open Interpreter
-RUN pip install --no-cache-dir open-interpreter
+# Install Open Interpreter, keeping pip's wheel cache in a BuildKit cache mount
+# so image rebuilds do not re-download every wheel
+RUN --mount=type=cache,target=/root/.cache/pip pip install open-interpreter
 
 # Create output directory
 RUN mkdir -p /output
@@ -119,6 +139,11 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
         dockerfile_path.write_text(dockerfile_content.strip())
         self.logger.info(f"Created Dockerfile at {dockerfile_path}")
 
+        # The image only needs the Dockerfile; keep everything else in work_dir
+        # (e.g. the rendered script) out of the context tarball sent to the daemon.
+        dockerignore_path = work_dir / ".dockerignore"
+        dockerignore_path.write_text("*\n!Dockerfile\n")
+
     def _create_generation_script(self, work_dir: Path, spec: LibrarySpec) -> Path:
         """
         Render generate_library.py from the Jinja2 template generate_library.py.j2
@@ -173,28 +198,63 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
 
         return script_path
 
-    def _build_container(self, work_dir: Path) -> None:
-        """Build the Docker container"""
+    def _create_output_dir(self) -> Path:
+        """Create the cache directory that receives logs and generated files."""
+        output_dir = self.cache_path / f"output_{int(time.time())}"
+        output_dir.mkdir(exist_ok=True)
+        return output_dir
+
+    @staticmethod
+    def _stream_output(
+        process: subprocess.Popen[bytes], log_f: BinaryIO, prefix: str
+    ) -> None:
+        """
+        Echo a process's combined stdout/stderr and append it to a log file.
+
+        Lines stay as bytes end to end, and the log file is left to its normal
+        buffering instead of being flushed after every line.
+        """
+        if not process.stdout:
+            return
+        sys.stdout.flush()
+        # Replaced stdouts (Jupyter, StringIO) have no binary buffer
+        console = getattr(sys.stdout, "buffer", None)
+        tag = f"[{prefix}] ".encode()
+        for line in process.stdout:
+            if console is not None:
+                console.write(tag)
+                console.write(line)
+                console.flush()
+            else:
+                sys.stdout.write(f"[{prefix}] {line.decode(errors='replace')}")
+            log_f.write(line)
+
+    def _build_container(self, work_dir: Path, log_file: Path) -> None:
+        """Build the Docker container, streaming the build output to log_file"""
         self.logger.info(f"Building Docker container: {self.container_name}")
 
         build_cmd = ["docker", "build", "-t", self.container_name, str(work_dir)]
 
-        try:
-            result = subprocess.run(
-                build_cmd, cwd=work_dir, capture_output=True, text=True, check=True
+        with open(log_file, "wb") as log_f:
+            with subprocess.Popen(
+                build_cmd,
+                cwd=work_dir,
+                env={**os.environ, "DOCKER_BUILDKIT": "1"},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            ) as process:
+                self._stream_output(process, log_f, "BUILD")
+
+        if process.returncode != 0:
+            self.logger.error(f"Failed to build container, see {log_file}")
+            raise RuntimeError(
+                f"Docker build failed with exit code {process.returncode}, "
+                f"see {log_file}"
             )
-            self.logger.info("Container built successfully")
-            if result.stdout:
-                self.logger.debug(f"Build output: {result.stdout}")
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Failed to build container: {e.stderr}")
-            raise RuntimeError(f"Docker build failed: {e.stderr}") from e
+        self.logger.info("Container built successfully")
 
-    def _run_container(self, work_dir: Path) -> Dict[str, Any]:
+    def _run_container(self, work_dir: Path, output_dir: Path) -> Dict[str, Any]:
         """Run the container and capture output"""
-        output_dir = self.cache_path / f"output_{int(time.time())}"
-        output_dir.mkdir(exist_ok=True)
-
         log_file = output_dir / "container.log"
 
         self.logger.info(f"Running container with output directory: {output_dir}")
@@ -205,45 +265,67 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
             env_vars.extend(["-e", f"OPENAI_API_KEY={self.config.openai_api_key}"])
         env_vars.extend(["-e", f"MODEL={self.config.model}"])
 
-        run_cmd = (
+        run_name = f"{self.container_name}_run"
+        create_cmd = (
             [
                 "docker",
-                "run",
+                "create",
                 "--rm",
                 "--name",
-                f"{self.container_name}_run",
+                run_name,
                 "-v",
                 f"{output_dir}:/output",
-                "-v",
-                f"{work_dir / 'generate_library.py'}:/workspace/generate_library.py",
             ]
             + env_vars
             + [self.container_name, "python", "/workspace/generate_library.py"]
         )
+        # Copy the script in over the docker socket rather than bind-mounting a
+        # file out of a temporary directory.
+        copy_cmd = [
+            "docker",
+            "cp",
+            str(work_dir / "generate_library.py"),
+            f"{run_name}:/workspace/generate_library.py",
+        ]
+        run_cmd = ["docker", "start", "--attach", run_name]
 
         try:
             self.logger.info("Starting container execution...")
 
-            with open(log_file, "w", encoding="utf-8") as log_f:
+            subprocess.run(create_cmd, capture_output=True, text=True, check=True)
+            subprocess.run(copy_cmd, capture_output=True, text=True, check=True)
+
+            with open(log_file, "wb") as log_f:
                 with subprocess.Popen(
                     run_cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    encoding="utf-8",
                 ) as process:
-
-                    # Stream output in real-time
-                    if process.stdout:
-                        for line in process.stdout:
-                            print(f"[CONTAINER] {line.rstrip()}")
-                            log_f.write(line)
-                            log_f.flush()
-
-                    process.wait(timeout=self.config.timeout_seconds)
-
+                    # The streaming loop below blocks until the container closes
+                    # its stdout, so enforce the deadline from a watchdog thread.
+                    timed_out = threading.Event()
+
+                    def on_timeout() -> None:
+                        timed_out.set()
+                        self._stop_container()
+                        # Kill the host-side client as well, so the read loop ends
+                        # even if docker stop hangs or fails.
+                        process.kill()
+
+                    watchdog = threading.Timer(self.config.timeout_seconds, on_timeout)
+                    watchdog.daemon = True
+                    watchdog.start()
+                    try:
+                        # Stream output in real-time
+                        self._stream_output(process, log_f, "CONTAINER")
+                        process.wait()
+                    finally:
+                        watchdog.cancel()
+
+                    if timed_out.is_set():
+                        raise subprocess.TimeoutExpired(
+                            run_cmd, self.config.timeout_seconds
+                        )
                     if process.returncode != 0:
                         raise subprocess.CalledProcessError(process.returncode, run_cmd)
 
@@ -257,12 +339,6 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
 
         except subprocess.TimeoutExpired as te:
             self.logger.error("Container execution timed out")
-
-            subprocess.run(
-                ["docker", "kill", f"{self.container_name}_run"],
-                capture_output=True,
-                check=True,
-            )
             raise RuntimeError(
                 f"Container execution timed out after {self.config.timeout_seconds} seconds"
             ) from te
@@ -271,29 +347,90 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
             self.logger.error(
                 f"Container execution failed with exit code {e.returncode}"
             )
+            # A container that was created but never started is not auto-removed
+            subprocess.run(
+                ["docker", "rm", "-f", run_name], capture_output=True, check=False
+            )
             error_info = {
                 "error": "Container execution failed",
                 "exit_code": e.returncode,
             }
 
+            # docker create / docker cp failures only report on stderr
+            if e.stderr:
+                self.logger.error(f"docker: {e.stderr.strip()}")
+                error_info["stderr"] = e.stderr
+
             # Try to read error logs
             if log_file.exists():
-                error_info["logs"] = log_file.read_text(encoding="utf-8")
+                error_info["logs"] = log_file.read_text(
+                    encoding="utf-8", errors="replace"
+                )
 
             raise RuntimeError(f"Container execution failed: {error_info}") from e
 
-    def generate_library(self, spec: LibrarySpec) -> Dict[str, Any]:
+    def _stop_container(self) -> None:
+        """Ask the running container to exit: SIGTERM, then SIGKILL after 5s."""
+        try:
+            subprocess.run(
+                ["docker", "stop", "-t", "5", f"{self.container_name}_run"],
+                capture_output=True,
+                check=False,
+                timeout=10,
+            )
+        except Exception as exc:
+            self.logger.warning("docker stop failed: %s", exc)
+
+    def _spec_key(self, spec: LibrarySpec) -> str:
+        """Digest of everything that determines a generation's output."""
+        payload = json.dumps(asdict(spec), sort_keys=True) + "\0" + self.config.model
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+    def _find_previous_generation(self, spec_file: Path) -> Optional[Dict[str, Any]]:
+        """Return the result of an earlier identical generation, if it is intact."""
+        if not spec_file.exists():
+            return None
+        try:
+            output_dir = Path(
+                json.loads(spec_file.read_text(encoding="utf-8"))["output_directory"]
+            )
+        except (ValueError, KeyError, OSError):
+            return None
+        if not (output_dir / "generation_summary.json").exists():
+            return None
+        return {
+            "status": "cache_hit",
+            "output_directory": str(output_dir),
+            "log_file": str(output_dir / "container.log"),
+        }
+
+    def generate_library(
+        self, spec: LibrarySpec, force: bool = False
+    ) -> Dict[str, Any]:
         """
         Generate a Python library using Open Interpreter in Docker
 
+        Identical specs (for the same model) reuse the previous output directory
+        instead of rebuilding and rerunning the container.
+
         Args:
             spec: Library specification including name, description, and requirements
+            force: Regenerate even if an identical spec was generated before
 
         Returns:
             Dict containing generation results and paths
         """
         self.logger.info(f"Starting library generation for: {spec.name}")
 
+        spec_file = self.cache_path / f"by_spec_{self._spec_key(spec)}.json"
+        if not force:
+            previous = self._find_previous_generation(spec_file)
+            if previous:
+                self.logger.info(
+                    f"Reusing identical generation at {previous['output_directory']}"
+                )
+                return previous
+
         # Create temporary working directory
         with tempfile.TemporaryDirectory() as temp_dir:
             work_dir = Path(temp_dir)
@@ -305,11 +442,14 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
                 # Create generation script
                 self._create_generation_script(work_dir, spec)
 
+                # Logs and generated files share one cache directory
+                output_dir = self._create_output_dir()
+
                 # Build container
-                self._build_container(work_dir)
+                self._build_container(work_dir, output_dir / "build.log")
 
                 # Run container
-                result = self._run_container(work_dir)
+                result = self._run_container(work_dir, output_dir)
 
                 # Cleanup container image
                 subprocess.run(
@@ -318,6 +458,11 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
                     check=False,
                 )
 
+                spec_file.write_text(
+                    json.dumps({"output_directory": result["output_directory"]}),
+                    encoding="utf-8",
+                )
+
                 self.logger.info("Library generation completed successfully")
                 return result
 
@@ -333,20 +478,42 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
 
                 raise
 
-    def list_generated_libraries(self) -> List[Dict[str, Any]]:
-        """List all generated libraries in the cache"""
-        libraries = []
+    def list_generated_libraries(
+        self, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List generated libraries in the cache, oldest first.
 
+        Directories are ordered by the timestamp in their name, so only the
+        summaries that are actually returned get parsed. Directories without a
+        generation_summary.json (in progress or failed) are skipped.
+
+        Args:
+            limit: If given, only return the most recent ``limit`` libraries.
+        """
+        dated_dirs = []
         for output_dir in self.cache_path.glob("output_*"):
-            if output_dir.is_dir():
-                summary_file = output_dir / "generation_summary.json"
-                if summary_file.exists():
-                    with open(summary_file, encoding="utf-8") as f:
-                        summary = json.load(f)
-                        summary["output_path"] = str(output_dir)
-                        libraries.append(summary)
+            if not (output_dir / "generation_summary.json").is_file():
+                continue
+            try:
+                timestamp = int(output_dir.name.split("_")[1])
+            except (ValueError, IndexError):
+                continue
+            dated_dirs.append((timestamp, output_dir))
 
-        return sorted(libraries, key=lambda x: x.get("generation_timestamp", ""))
+        if limit is None:
+            candidates = sorted(dated_dirs)
+        else:
+            candidates = sorted(heapq.nlargest(limit, dated_dirs))
+
+        libraries = []
+        for _, output_dir in candidates:
+            with open(output_dir / "generation_summary.json", encoding="utf-8") as f:
+                summary = json.load(f)
+                summary["output_path"] = str(output_dir)
+                libraries.append(summary)
+
+        return libraries
 
     def cleanup_cache(self, older_than_days: int = 7) -> int:
         """Remove old generated libraries from cache"""
@@ -366,4 +533,14 @@ CMD ["python", "-c", "import interpreter; print('Open Interpreter ready')"]
                     # Skip directories that don't match the expected naming pattern
                     pass
 
+        # Drop spec pointers whose output directory no longer exists
+        for spec_file in self.cache_path.glob("by_spec_*.json"):
+            try:
+                target = json.loads(spec_file.read_text(encoding="utf-8"))
+                if Path(target["output_directory"]).is_dir():
+                    continue
+            except (ValueError, KeyError, TypeError, OSError):
+                pass
+            spec_file.unlink(missing_ok=True)
+
         return removed_count
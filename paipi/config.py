@@ -118,6 +118,14 @@ class Config:
         self.host: str = os.getenv("HOST", "0.0.0.0")
         self.port: int = int(os.getenv("PORT", "8000"))
         self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+        # Cached searches/READMEs older than this are still served, but a
+        # background refresh is started (stale-while-revalidate). 0 disables it.
+        self.search_cache_ttl: int = int(os.getenv("PAIPI_SEARCH_CACHE_TTL", "604800"))
+        self.readme_cache_ttl: int = int(os.getenv("PAIPI_README_CACHE_TTL", "0"))
+        # Concurrent worker-thread limits for blocking network, SQLite and LLM calls.
+        self.threads: int = int(os.getenv("PAIPI_THREADS", "32"))
+        self.db_threads: int = int(os.getenv("PAIPI_DB_THREADS", "8"))
+        self.ai_threads: int = int(os.getenv("PAIPI_AI_THREADS", "8"))
 
     def validate(self) -> None:
         """Validate required configuration."""
@@ -5,21 +5,39 @@ FastAPI application for PAIPI - AI-powered PyPI search.
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import tempfile
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
 
+import anyio
 from fastapi import APIRouter, Body, FastAPI, HTTPException, Query, Request
 from fastapi.responses import (
     FileResponse,
     JSONResponse,
     PlainTextResponse,
-    StreamingResponse,
+    Response,
 )
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel
 from starlette.middleware.cors import CORSMiddleware
 
 from paipi import __about__
@@ -28,7 +46,7 @@ from paipi.coder.generate_package import (
     GenerationConfig,
     LibrarySpec,
 )
-from paipi.main_package_glue import _normalize_model, _zip_dir_to_bytes
+from paipi.main_package_glue import _normalize_model, _zip_dir_to_file
 
 from .cache_manager import cache_manager
 from .client_readme import OpenRouterClientReadMe
@@ -44,6 +62,10 @@ from .openrouter_models import resolve_model_pool
 from .package_cache import CACHE_DB_PATH, package_cache
 from .pypi_scraper import PypiScraper
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
 
 class AvailabilityRequest(BaseModel):
     names: list[str]
@@ -64,50 +86,204 @@ def _optional_model_headers(model_used: Optional[str]) -> Dict[str, str]:
     return {"X-PAIPI-Model-Used": model_used}
 
 
-async def startup_event() -> None:
-    """On startup, intelligently load and update the package cache."""
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, _refresh_runtime_model_pool)
+# --- SINGLE-FLIGHT / STALE-WHILE-REVALIDATE ---
+# One in-flight task per key: concurrent identical cache misses await the same
+# upstream AI call instead of each firing their own.
+_inflight: Dict[str, asyncio.Task[Any]] = {}
+# Strong references to background refreshes so they are not garbage collected.
+_background_tasks: Set[asyncio.Task[Any]] = set()
+# Cache writes that finish after their response was sent; drained on shutdown.
+_pending_writes: Set[asyncio.Task[Any]] = set()
+
+
+def _single_flight(key: str, factory: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+    """Return the in-flight task for key, starting factory() if there is none."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+
+        def _forget(done: asyncio.Task[Any]) -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+
+        task.add_done_callback(_forget)
+    return task
+
+
+def _log_background_failure(task: asyncio.Task[Any]) -> None:
+    """Report (and thereby retrieve) the exception of a background task."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task failed: {task.exception()}")
+
+
+def _revalidate(key: str, factory: Callable[[], Awaitable[Any]]) -> None:
+    """Refresh a stale cache entry in the background, at most once per key."""
+    if key in _inflight:
+        return
+    task = _single_flight(key, factory)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_log_background_failure)
 
-    # This helper runs synchronous checks in a thread to not block the event loop
-    def check_cache_status() -> str:
-        if not CACHE_DB_PATH.exists():
-            return "missing"
-        if not package_cache.has_data():
-            return "empty"
 
-        # Check if cache is older than 24 hours (86400 seconds)
-        file_mod_time = os.path.getmtime(CACHE_DB_PATH)
-        if (time.time() - file_mod_time) > 86400:
-            return "outdated"
+def _write_behind(write: Awaitable[Any]) -> None:
+    """Run a cache write in the background so the response need not wait."""
+    task = asyncio.ensure_future(write)
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    task.add_done_callback(_log_background_failure)
 
-        return "recent"
 
-    status = await loop.run_in_executor(None, check_cache_status)
+async def _drain_pending_writes() -> None:
+    """Wait for background cache writes to finish."""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+
+# --- THREAD OFFLOADING ---
+# Blocking work runs on anyio's worker threads (shared with Starlette), capped
+# per kind so SQLite lookups are never queued behind slow AI/PyPI/docker calls,
+# and multi-second LLM calls cannot occupy every network worker.
+# Keep this work on threads, not a ProcessPoolExecutor: it is I/O-bound, the
+# AI clients and SQLite connections cannot be pickled across to a worker, and
+# each worker process would carry its own copy of the app's memory.
+_db_limiter = anyio.CapacityLimiter(config.db_threads)
+_net_limiter = anyio.CapacityLimiter(config.threads)
+_ai_limiter = anyio.CapacityLimiter(config.ai_threads)
+
+
+async def _run_db(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking cache call in a worker thread under the SQLite limit."""
+    return await anyio.to_thread.run_sync(func, *args, limiter=_db_limiter)
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking AI, network or filesystem call in a worker thread."""
+    return await anyio.to_thread.run_sync(func, *args, limiter=_net_limiter)
+
+
+async def _run_ai(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking LLM or code-generation call in a worker thread."""
+    return await anyio.to_thread.run_sync(func, *args, limiter=_ai_limiter)
+
+
+def _is_stale(created_at: float, ttl: int) -> bool:
+    """True when a cache entry is older than its soft TTL (0 disables)."""
+    return ttl > 0 and time.time() - created_at > ttl
+
+
+# --- LOGGING ---
+# The paipi loggers only enqueue records; a listener thread does the stream
+# writes, so logging from a handler never blocks the event loop on stdout.
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_log_listener() -> None:
+    """Route the paipi loggers through a queue drained by a background thread."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    package_logger = logging.getLogger("paipi")
+    package_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    package_logger.setLevel(logging.INFO)
+    package_logger.propagate = False
+    _log_listener.start()
+
+
+def _stop_log_listener() -> None:
+    """Flush queued records and restore normal propagation."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    package_logger = logging.getLogger("paipi")
+    for handler in list(package_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            package_logger.removeHandler(handler)
+    package_logger.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+
+
+# Background refresh of the PyPI package index; at most one at a time.
+_index_update_task: Optional[asyncio.Task[None]] = None
+
+
+def _start_index_update() -> None:
+    """Start a background package index update unless one is running."""
+    global _index_update_task
+    if _index_update_task is not None and not _index_update_task.done():
+        logger.info("Package index update already in progress.")
+        return
+    _index_update_task = asyncio.ensure_future(
+        _run_blocking(package_cache.update_cache)
+    )
+    _index_update_task.add_done_callback(_log_index_update_result)
+
+
+def _log_index_update_result(task: asyncio.Task[None]) -> None:
+    """Report how a background package index update ended."""
+    if task.cancelled():
+        logger.warning("Package index update was cancelled.")
+    elif task.exception() is not None:
+        logger.error("Package index update failed.", exc_info=task.exception())
+    else:
+        logger.info("Package index update finished.")
+
+
+def _package_cache_status() -> str:
+    """Classify the package index as missing, empty, outdated or recent."""
+    try:
+        db_stat = os.stat(CACHE_DB_PATH)
+    except FileNotFoundError:
+        return "missing"
+    if not package_cache.has_data():
+        return "empty"
+
+    # Check if cache is older than 24 hours (86400 seconds)
+    if (time.time() - db_stat.st_mtime) > 86400:
+        return "outdated"
+
+    return "recent"
+
+
+async def startup_event() -> None:
+    """On startup, intelligently load and update the package cache."""
+    _start_log_listener()
+    await _run_blocking(_refresh_runtime_model_pool)
+
+    # A stat and an EXISTS query: cheaper inline than a trip to a worker thread
+    status = _package_cache_status()
 
     if status == "recent":
-        print("Package cache is recent and populated. Loading into memory.")
-        await loop.run_in_executor(None, package_cache.load_into_memory)
+        logger.info("Package cache is recent and populated. Loading into memory.")
+        await _run_blocking(package_cache.load_into_memory)
     elif status == "outdated":
-        print(
+        logger.warning(
             "Package cache is outdated. Loading stale data and triggering background update."
         )
         # Load the old data first for immediate availability
-        await loop.run_in_executor(None, package_cache.load_into_memory)
+        await _run_blocking(package_cache.load_into_memory)
         # Then start the background update without awaiting it
-        loop.run_in_executor(None, package_cache.update_cache)
+        _start_index_update()
     elif status in ["missing", "empty"]:
         if status == "missing":
-            print("Package cache database not found.")
+            logger.warning("Package cache database not found.")
         else:  # empty
-            print("Package cache is empty.")
-        print("Triggering background update to populate cache.")
+            logger.warning("Package cache is empty.")
+        logger.info("Triggering background update to populate cache.")
         # Start the background update without awaiting it
-        loop.run_in_executor(None, package_cache.update_cache)
+        _start_index_update()
 
     # Print cache manager stats
-    stats = cache_manager.get_cache_stats()
-    print(
+    stats = await _run_db(cache_manager.get_cache_stats)
+    logger.info(
         f"Cache stats - Search: {stats['search']}, README: {stats['readme']}, Package: {stats['package']}"
     )
 
@@ -116,16 +292,20 @@ def shutdown_event() -> None:
     """Close database connections on shutdown."""
     package_cache.close()
     cache_manager.close()
-    print("Cache database connections closed.")
+    logger.info("Cache database connections closed.")
+    _stop_log_listener()
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     """Run startup and shutdown hooks using FastAPI's lifespan API."""
     await startup_event()
+    await pypi_scraper.open()
     try:
         yield
     finally:
+        await _drain_pending_writes()
+        await pypi_scraper.aclose()
         shutdown_event()
 
 
@@ -209,12 +389,12 @@ def _refresh_runtime_model_pool() -> None:
     config.set_openrouter_models(resolution.selected_models)
 
     if resolution.unavailable_configured_models:
-        print(
+        logger.warning(
             "Skipping unavailable configured model(s): "
             + ", ".join(resolution.unavailable_configured_models)
         )
 
-    print("Using OpenRouter model pool: " + ", ".join(config.openrouter_models))
+    logger.info("Using OpenRouter model pool: " + ", ".join(config.openrouter_models))
     _configure_ai_clients()
 
 
@@ -224,10 +404,9 @@ pypi_scraper = PypiScraper()
 
 
 # --- CORE ENDPOINTS ---
-@app.get("/api")
-async def api_root() -> Dict[str, Any]:
-    """API root endpoint with basic information."""
-    return {
+# Static bodies, built once at import instead of per request.
+_API_ROOT_BODY = json.dumps(
+    {
         "message": "Welcome to PAIPI - AI-Powered PyPI Search",
         "description": "Search for Python packages using AI knowledge",
         "endpoints": [
@@ -240,31 +419,54 @@ async def api_root() -> Dict[str, Any]:
             "GET /api/health - Health check",
         ],
     }
+).encode("utf-8")
+_HEALTH_STATIC: Dict[str, Any] = {
+    "status": "healthy",
+    "service": "paipi",
+    "version": __about__.__version__,
+}
+
+
+@app.get("/api")
+async def api_root() -> Response:
+    """API root endpoint with basic information."""
+    return Response(content=_API_ROOT_BODY, media_type="application/json")
 
 
 @api_router.get("/health")
 async def health_check() -> Dict[str, Any]:
     """Health check endpoint."""
-    cache_stats = cache_manager.get_cache_stats()
+    cache_stats = await _run_db(cache_manager.get_cache_stats)
     return {
-        "status": "healthy",
-        "service": "paipi",
-        "version": __about__.__version__,
+        **_HEALTH_STATIC,
         "ai_client_available": ai_client is not None,
         "cache_stats": cache_stats,
     }
 
 
+def _cached_json(model: BaseModel) -> Response:
+    """
+    Serialize a model read back from our own cache, which was validated when
+    it was parsed, without FastAPI validating it again against response_model.
+    """
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
 @api_router.get("/search", response_model=SearchResponse)
 async def search_packages(
-    q: str = Query(
-        "",
-        description="Search query for Python packages (empty for all cached results)",
-    ),
+    q: Annotated[
+        str,
+        Query(
+            description=(
+                "Search query for Python packages (empty for all cached results)"
+            ),
+        ),
+        AfterValidator(str.strip),
+    ] = "",
     size: Optional[int] = Query(
         20, description="Number of results to return", ge=1, le=100
     ),
-) -> SearchResponse:
+) -> Union[SearchResponse, Response]:
     """
     Search for Python packages using AI knowledge, augmented with live PyPI data.
 
@@ -273,7 +475,7 @@ async def search_packages(
     metadata, while non-existent ones remain as AI suggestions. Results are cached.
 
     Args:
-        q: Search query string.
+        q: Search query string, stripped of surrounding whitespace.
         size: Maximum number of results to return (1-100).
 
     Returns:
@@ -285,129 +487,153 @@ async def search_packages(
             detail="AI service is not available. Please check configuration.",
         )
 
-    query = q.strip()
-
     # Handle empty query - return concatenated cached results
-    if not query:
+    if not q:
         try:
-            # Use asyncio to make the synchronous OpenAI client work with FastAPI
-            loop = asyncio.get_event_loop()
-            all_cached = await loop.run_in_executor(
-                None, cache_manager.get_all_cached_searches
+            # Newest cached results, read only as far as the requested size
+            limited_results = await _run_db(
+                cache_manager.get_recent_search_results, size
             )
 
-            # Combine all cached results
-            all_results = []
-            for response in all_cached:
-                all_results.extend(response.results)
-
-            # Limit to requested size
-            limited_results = all_results[:size]
-
-            return SearchResponse(
-                info={"query": "", "count": len(limited_results)},
-                results=limited_results,
+            return _cached_json(
+                SearchResponse.model_construct(
+                    info={"query": "", "count": len(limited_results)},
+                    results=limited_results,
+                )
             )
 
         except Exception as e:
-            print(f"Error retrieving cached results: {e}")
+            logger.error(f"Error retrieving cached results: {e}")
             return SearchResponse(info={"query": "", "count": 0}, results=[])
 
+    cache_key = f"search:{q.lower()}:{size}"
+    search = functools.partial(_search_and_augment, q, size or 20)
+
     # Check cache first
     try:
-        loop = asyncio.get_event_loop()
-        cached_result = await loop.run_in_executor(
-            None, lambda: cache_manager.get_cached_search(query)
-        )
+        cached = await _run_db(cache_manager.get_cached_search_entry, q)
 
-        if cached_result:
+        if cached:
+            cached_result, created_at = cached
+            if _is_stale(created_at, config.search_cache_ttl):
+                _revalidate(cache_key, search)
             # Limit cached results to requested size
             limited_results = cached_result.results[:size]
-            return SearchResponse(info=cached_result.info, results=limited_results)
+            return _cached_json(
+                SearchResponse.model_construct(
+                    info=cached_result.info, results=limited_results
+                )
+            )
 
     except Exception as e:
-        print(f"Error checking search cache: {e}")
+        logger.error(f"Error checking search cache: {e}")
 
     # Generate new results via AI
     try:
-        loop = asyncio.get_event_loop()
-        # 1. Get initial results from the AI
-        ai_response = await loop.run_in_executor(
-            None, lambda: ai_client.search_packages(query, size or 20)
-        )
-
-        # --- MODIFICATION START: Add a Semaphore to limit concurrency ---
-        semaphore = asyncio.Semaphore(10)
-
-        # Helper to augment a single result with real PyPI data
-        async def augment_result(result: SearchResult) -> None:
-            async with semaphore:
-                metadata = await pypi_scraper.get_project_metadata(result.name)
-                if not (metadata and "info" in metadata):
-                    result.package_exists = False
-                    result.readme_cached = False
-                    result.package_cached = False
-                    return
-
-                info = metadata["info"]
-                result.version = info.get("version", "N/A")
-                result.summary = info.get("summary")
-                readme_content = info.get("description")
-                result.description = readme_content
-                result.author = info.get("author")
-                result.home_page = info.get("home_page")
-                result.license = info.get("license")
-                result.requires_python = info.get("requires_python")
-                result.package_url = info.get("package_url")
-                result.project_urls = info.get("project_urls", {})
-
-                if readme_content:
-                    readme_req = ReadmeRequest(
-                        name=result.name,
-                        summary=result.summary,
-                        description=result.description,
-                        install_cmd="",
-                    )
-                    await loop.run_in_executor(
-                        None,
-                        lambda: cache_manager.cache_readme(readme_req, readme_content),
-                    )
-                    result.readme_cached = True
-                else:
-                    result.readme_cached = await loop.run_in_executor(
-                        None, lambda: cache_manager.has_readme_by_name(result.name)
-                    )
-                readme_meta = await loop.run_in_executor(
-                    None, lambda: cache_manager.get_readme_metadata_by_name(result.name)
-                )
-                package_meta = await loop.run_in_executor(
-                    None, lambda: cache_manager.get_package_metadata_by_name(result.name)
-                )
-                result.readme_model = readme_meta.get("model")
-                result.package_model = package_meta.get("model")
-                result.package_cached = bool(package_meta)
-
-        # 2. Augment all results concurrently
-        if ai_response.results:
-            tasks = [augment_result(res) for res in ai_response.results]
-            await asyncio.gather(*tasks)
-
-        # 3. Cache the augmented results
-        await loop.run_in_executor(
-            None, lambda: cache_manager.cache_search_results(query, ai_response)
-        )
-        return ai_response
+        return await asyncio.shield(_single_flight(cache_key, search))
 
     except SearchGenerationError as e:
-        print(f"Search error: {e}")
+        logger.error(f"Search error: {e}")
         raise HTTPException(status_code=502, detail=str(e)) from e
     except Exception as e:
-        print(f"Search error: {e}")
+        logger.error(f"Search error: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while searching for packages"
         ) from e
 
 
+async def _search_and_augment(query: str, size: int) -> SearchResponse:
+    """Ask the AI for packages, augment them with live PyPI data and cache."""
+    if not ai_client:
+        raise SearchGenerationError("AI service is not available.")
+    search_client = ai_client
+
+    # 1. Get initial results from the AI
+    ai_response = await _run_ai(search_client.search_packages, query, size)
+
+    # README/package cache state for every result, in one batched lookup
+    cache_status = await _run_db(
+        cache_manager.batch_availability, [r.name for r in ai_response.results]
+    )
+
+    # PyPI READMEs found while augmenting; written in one transaction afterwards
+    readme_writes: list[tuple[ReadmeRequest, str]] = []
+
+    # Helper to augment a single result with real PyPI data. Concurrency is
+    # bounded by the scraper's connection pool, which also reuses keep-alive.
+    async def augment_result(result: SearchResult) -> SearchResult:
+        cached = cache_status[result.name]
+        # The search client already checked names against the PyPI simple
+        # index; when that index is loaded, a miss there will 404 here too.
+        if not result.package_exists and package_cache.is_loaded():
+            metadata = None
+        else:
+            metadata = await pypi_scraper.get_project_metadata(result.name)
+        if not (metadata and "info" in metadata):
+            return result.model_copy(
+                update={
+                    "package_exists": False,
+                    "readme_cached": False,
+                    "package_cached": False,
+                }
+            )
+
+        info = metadata["info"]
+        readme_content = info.get("description")
+        # Collect every field and apply them in one model_copy below
+        update: Dict[str, Any] = {
+            "version": info.get("version", "N/A"),
+            "summary": info.get("summary"),
+            "description": readme_content,
+            "author": info.get("author"),
+            "home_page": info.get("home_page"),
+            "license": info.get("license"),
+            "requires_python": info.get("requires_python"),
+            "package_url": info.get("package_url"),
+            "project_urls": info.get("project_urls", {}),
+        }
+
+        if readme_content:
+            readme_req = ReadmeRequest(
+                name=result.name,
+                summary=update["summary"],
+                description=readme_content,
+                install_cmd="",
+            )
+            readme_writes.append((readme_req, readme_content))
+            update["readme_cached"] = True
+            # The PyPI README becomes the newest entry, and it has no model
+            update["readme_model"] = None
+        else:
+            update["readme_cached"] = cached["readme_cached"]
+            update["readme_model"] = cached["readme_model"]
+        update["package_cached"] = cached["package_cached"]
+        update["package_model"] = cached["package_model"]
+        return result.model_copy(update=update)
+
+    # 2. Augment all results concurrently
+    if ai_response.results:
+        tasks = [augment_result(res) for res in ai_response.results]
+        ai_response.results = list(await asyncio.gather(*tasks))
+
+    # 3. Cache the augmented results. The in-memory copy is visible to the
+    #    next lookup right away; the SQLite writes happen after we respond.
+    cache_manager.remember_search_results(query, ai_response)
+    _write_behind(_persist_search(query, ai_response, readme_writes))
+    return ai_response
+
+
+async def _persist_search(
+    query: str,
+    response: SearchResponse,
+    readme_writes: list[tuple[ReadmeRequest, str]],
+) -> None:
+    """Write a search and the PyPI READMEs found for it to the cache."""
+    if readme_writes:
+        await _run_db(cache_manager.bulk_cache_readmes, readme_writes)
+    await _run_db(cache_manager.cache_search_results, query, response)
+
+
 # --- add endpoints in main.py ---
 
 
@@ -433,16 +659,19 @@ async def generate_readme(req: ReadmeRequest = Body(...)) -> PlainTextResponse:
             detail="AI service is not available. Please check configuration.",
         )
 
+    cache_key = "readme:" + req.model_dump_json()
+    generate = functools.partial(_generate_and_cache_readme, req)
+
     # Check cache first
     try:
-        loop = asyncio.get_event_loop()
-        cached_readme = await loop.run_in_executor(
-            None, lambda: cache_manager.get_cached_readme(req)
-        )
-
-        if cached_readme:
-            readme_meta = await loop.run_in_executor(
-                None, lambda: cache_manager.get_readme_metadata_by_name(req.name)
+        cached = await _run_db(cache_manager.get_cached_readme_entry, req)
+
+        if cached:
+            cached_readme, created_at = cached
+            if _is_stale(created_at, config.readme_cache_ttl):
+                _revalidate(cache_key, generate)
+            readme_meta = await _run_db(
+                cache_manager.get_readme_metadata_by_name, req.name
             )
             return PlainTextResponse(
                 content=cached_readme,
@@ -451,18 +680,12 @@ async def generate_readme(req: ReadmeRequest = Body(...)) -> PlainTextResponse:
             )
 
     except Exception as e:
-        print(f"Error checking README cache: {e}")
+        logger.error(f"Error checking README cache: {e}")
 
     # Generate new README via AI
     try:
-        loop = asyncio.get_event_loop()
-        markdown, model_used = await loop.run_in_executor(
-            None, lambda: readme_client.generate_readme_markdown_with_model(req)
-        )
-
-        # Cache the results
-        await loop.run_in_executor(
-            None, lambda: cache_manager.cache_readme(req, markdown, model_used)
+        markdown, model_used = await asyncio.shield(
+            _single_flight(cache_key, generate)
         )
 
         # Return as raw markdown (not JSON) so clients can save directly as README.md
@@ -473,12 +696,27 @@ async def generate_readme(req: ReadmeRequest = Body(...)) -> PlainTextResponse:
         )
 
     except Exception as e:
-        print(f"README generation error: {e}")
+        logger.error(f"README generation error: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while generating README"
         ) from e
 
 
+async def _generate_and_cache_readme(req: ReadmeRequest) -> tuple[str, Optional[str]]:
+    """Generate a README via the AI client and cache it."""
+    if not readme_client:
+        raise RuntimeError("README client is not available.")
+    client = readme_client
+
+    markdown, model_used = await _run_ai(
+        client.generate_readme_markdown_with_model, req
+    )
+
+    # Cache the results
+    await _run_db(cache_manager.cache_readme, req, markdown, model_used)
+    return markdown, model_used
+
+
 @api_router.post(
     "/generate_package",
     responses={
@@ -490,7 +728,7 @@ async def generate_readme(req: ReadmeRequest = Body(...)) -> PlainTextResponse:
 )
 async def generate_package(
     payload: PackageGenerateRequest = Body(...),
-) -> StreamingResponse:
+) -> FileResponse:
     """
     Generate a package ZIP from README + metadata using the Docker Open Interpreter
     flow in paipi.generate_package, with simple name-based caching.
@@ -511,29 +749,22 @@ async def generate_package(
 
     # 1) Cache check (same behavior you had)
     try:
-        loop = asyncio.get_event_loop()
-        cached_zip = await loop.run_in_executor(
-            None, lambda: cache_manager.get_cached_package(package_name)
-        )
+        cached_zip = await _run_db(cache_manager.get_cached_package_path, package_name)
 
         if cached_zip:
-            package_meta = await loop.run_in_executor(
-                None, lambda: cache_manager.get_package_metadata_by_name(package_name)
+            package_meta = await _run_db(
+                cache_manager.get_package_metadata_by_name, package_name
             )
-            # What was intended here?
-            # from io import BytesIO
-            # _zip_io = BytesIO(cached_zip)
-            return StreamingResponse(
-                iter([cached_zip]),
+            # Served straight from disk (sendfile where available)
+            return FileResponse(
+                cached_zip,
                 media_type="application/zip",
-                headers={
-                    "Content-Disposition": f'attachment; filename="{package_name}.zip"',
-                    **_optional_model_headers(package_meta.get("model")),
-                },
+                filename=f"{package_name}.zip",
+                headers=_optional_model_headers(package_meta.get("model")),
             )
 
     except Exception as e:
-        print(f"Error checking package cache: {e}")
+        logger.error(f"Error checking package cache: {e}")
 
     # 2) Not cached → invoke generator
     try:
@@ -574,37 +805,40 @@ async def generate_package(
         )
 
         # Run the container & get an output directory path
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, lambda: generator.generate_library(spec)
-        )
+        result = await _run_ai(generator.generate_library, spec)
 
         output_dir = Path(result["output_directory"])
 
-        # 3) Zip the output directory in-memory
-        zip_bytes = await loop.run_in_executor(
-            None, lambda: _zip_dir_to_bytes(output_dir)
-        )
-
-        # 4) Cache the bytes by package name (same key you were using)
-        await loop.run_in_executor(
-            None, lambda: cache_manager.cache_package(package_name, zip_bytes, normalized_model)
+        # 3) Zip the output directory to a temp file next to the cache, so
+        #    moving it into place is a rename rather than a copy
+        fd, tmp_name = tempfile.mkstemp(suffix=".zip", dir=cache_manager.packages_dir)
+        os.close(fd)
+        try:
+            await _run_blocking(_zip_dir_to_file, output_dir, Path(tmp_name))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        # 4) Cache the file by package name (same key you were using)
+        zip_path = await _run_db(
+            cache_manager.cache_package_file,
+            package_name,
+            Path(tmp_name),
+            normalized_model,
         )
 
-        return StreamingResponse(
-            iter([zip_bytes]),
+        return FileResponse(
+            zip_path,
             media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{package_name}.zip"',
-                **_optional_model_headers(normalized_model),
-            },
+            filename=f"{package_name}.zip",
+            headers=_optional_model_headers(normalized_model),
         )
 
     except HTTPException:
         # bubble up explicit HTTP errors
         raise
     except Exception as e:
-        print(f"Package generation error: {e}")
+        logger.error(f"Package generation error: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while generating package"
         ) from e
@@ -614,15 +848,14 @@ async def generate_package(
 async def get_cache_stats() -> Dict[str, Any]:
     """Get cache statistics."""
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(None, cache_manager.get_cache_stats)
+        stats = await _run_db(cache_manager.get_cache_stats)
         return {
             "status": "success",
             "cache_stats": stats,
             "cache_directory": str(cache_manager.cache_dir),
         }
     except Exception as e:
-        print(f"Error getting cache stats: {e}")
+        logger.error(f"Error getting cache stats: {e}")
         return {
             "status": "error",
             "error": str(e),
@@ -639,14 +872,13 @@ async def clear_cache(
 ) -> Dict[str, str]:
     """Clear cache entries."""
     try:
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, lambda: cache_manager.clear_cache(cache_type))
+        await _run_db(cache_manager.clear_cache, cache_type)
 
         message = f"Cleared {cache_type or 'all'} cache(s) successfully"
         return {"status": "success", "message": message}
 
     except Exception as e:
-        print(f"Error clearing cache: {e}")
+        logger.error(f"Error clearing cache: {e}")
         return {"status": "error", "message": str(e)}
 
 
@@ -655,12 +887,11 @@ async def availability(
     name: str = Query(..., description="Package name")
 ) -> Dict[str, Any]:
     """Return whether README and package ZIP are already cached for a name."""
-    loop = asyncio.get_event_loop()
     readme_cached, package_cached, readme_meta, package_meta = await asyncio.gather(
-        loop.run_in_executor(None, lambda: cache_manager.has_readme_by_name(name)),
-        loop.run_in_executor(None, lambda: cache_manager.has_package_by_name(name)),
-        loop.run_in_executor(None, lambda: cache_manager.get_readme_metadata_by_name(name)),
-        loop.run_in_executor(None, lambda: cache_manager.get_package_metadata_by_name(name)),
+        _run_db(cache_manager.has_readme_by_name, name),
+        _run_db(cache_manager.has_package_by_name, name),
+        _run_db(cache_manager.get_readme_metadata_by_name, name),
+        _run_db(cache_manager.get_package_metadata_by_name, name),
     )
     return {
         "name": name,
@@ -674,36 +905,8 @@ async def availability(
 @api_router.post("/availability/batch")
 async def availability_batch(payload: AvailabilityRequest) -> Dict[str, Any]:
     """Batch availability check for multiple names."""
-    loop = asyncio.get_event_loop()
-    results: list[Dict[str, Any]] = []
-    for n in payload.names:
-        readme_cached, package_cached, readme_meta, package_meta = await asyncio.gather(
-            loop.run_in_executor(
-                None,
-                lambda n=n: cache_manager.has_readme_by_name(n),  # type: ignore[misc]
-            ),
-            loop.run_in_executor(
-                None,
-                lambda n=n: cache_manager.has_package_by_name(n),  # type: ignore[misc]
-            ),
-            loop.run_in_executor(
-                None,
-                lambda n=n: cache_manager.get_readme_metadata_by_name(n),  # type: ignore[misc]
-            ),
-            loop.run_in_executor(
-                None,
-                lambda n=n: cache_manager.get_package_metadata_by_name(n),  # type: ignore[misc]
-            ),
-        )
-        results.append(
-            {
-                "name": n,
-                "readme_cached": bool(readme_cached),
-                "package_cached": bool(package_cached),
-                "readme_model": readme_meta.get("model"),
-                "package_model": package_meta.get("model"),
-            }
-        )
+    status = await _run_db(cache_manager.batch_availability, payload.names)
+    results: list[Dict[str, Any]] = [{"name": n, **status[n]} for n in payload.names]
     return {"items": results}
 
 
@@ -717,10 +920,9 @@ async def availability_batch(payload: AvailabilityRequest) -> Dict[str, Any]:
 )
 async def get_readme_by_name(name: str) -> PlainTextResponse:
     """Return the most recent cached README for a package name, if present."""
-    loop = asyncio.get_event_loop()
     md, readme_meta = await asyncio.gather(
-        loop.run_in_executor(None, lambda: cache_manager.get_readme_by_name(name)),
-        loop.run_in_executor(None, lambda: cache_manager.get_readme_metadata_by_name(name)),
+        _run_db(cache_manager.get_readme_by_name, name),
+        _run_db(cache_manager.get_readme_metadata_by_name, name),
     )
     if not md:
         raise HTTPException(status_code=404, detail="README not found for this package")
@@ -734,8 +936,7 @@ async def get_readme_by_name(name: str) -> PlainTextResponse:
 @api_router.get("/search/history")
 async def search_history() -> Dict[str, Any]:
     """Return saved past searches with timestamps and result counts."""
-    loop = asyncio.get_event_loop()
-    hist = await loop.run_in_executor(None, cache_manager.get_search_history)
+    hist = await _run_db(cache_manager.get_search_history)
     return {"items": hist}
 
 
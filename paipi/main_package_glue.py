@@ -1,12 +1,39 @@
 # --- new/updated imports at top of main.py ---
-import io
+import functools
+import os
+import tempfile
 import zipfile
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 
 # NEW: import the generator bits
 
+# Archives up to this size are built in memory; larger ones spill to disk.
+ZIP_SPOOL_MAX_BYTES = 4 * 1024 * 1024
 
+
+# Friendly/legacy model names -> concrete API model ids used by Open Interpreter
+_MODEL_MAP: Dict[str, str] = {
+    # OpenAI "frontier"
+    "gpt-5": "gpt-5",  # if enabled for your key
+    "gpt-4.1": "gpt-4.1",
+    "gpt-4o": "gpt-4o",
+    "gpt-4o-mini": "gpt-4o-mini",
+    "o4-mini": "o4-mini",
+    "o3-mini": "o3-mini",
+    "o3-mini-high": "o3-mini-high",
+    # Common aliases
+    "gpt-4": "gpt-4o",  # alias to a modern 4o
+    "gpt4": "gpt-4o",
+    "gpt-4-turbo": "gpt-4o",
+    # If someone passes vendor-y names, keep a best-effort default
+    "claude-3.5-sonnet": "gpt-4o",
+    "gemini-2.0-flash": "gpt-4o-mini",
+    "mixtral-8x7b": "gpt-4o-mini",
+}
+
+
+@functools.lru_cache(maxsize=256)
 def _normalize_model(user_model: str | None) -> str:
     """
     Map friendly/legacy names to concrete API model ids used by Open Interpreter.
@@ -16,35 +43,42 @@ def _normalize_model(user_model: str | None) -> str:
         return "gpt-4o-mini"  # default: fast/cheap/good
 
     m = user_model.strip().lower().replace("_", "-")
+    return _MODEL_MAP.get(m, "gpt-4o-mini")
+
+
+def _iter_files(dir_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, arcname) for every file under dir_path. os.walk reads entry
+    types from the directory listing, so there is no extra stat per file.
+    """
+    for root, _dirs, files in os.walk(dir_path):
+        for filename in files:
+            path = os.path.join(root, filename)
+            yield path, os.path.relpath(path, dir_path)
 
-    MODEL_MAP: Dict[str, str] = {
-        # OpenAI "frontier"
-        "gpt-5": "gpt-5",  # if enabled for your key
-        "gpt-4.1": "gpt-4.1",
-        "gpt-4o": "gpt-4o",
-        "gpt-4o-mini": "gpt-4o-mini",
-        "o4-mini": "o4-mini",
-        "o3-mini": "o3-mini",
-        "o3-mini-high": "o3-mini-high",
-        # Common aliases
-        "gpt-4": "gpt-4o",  # alias to a modern 4o
-        "gpt4": "gpt-4o",
-        "gpt-4-turbo": "gpt-4o",
-        # If someone passes vendor-y names, keep a best-effort default
-        "claude-3.5-sonnet": "gpt-4o",
-        "gemini-2.0-flash": "gpt-4o-mini",
-        "mixtral-8x7b": "gpt-4o-mini",
-    }
-    return MODEL_MAP.get(m, "gpt-4o-mini")
-
-
-def _zip_dir_to_bytes(dir_path: Path) -> bytes:
-    """
-    Zip a directory into memory and return raw bytes.
-    """
-    with io.BytesIO() as buf:
-        with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for p in dir_path.rglob("*"):
-                if p.is_file():
-                    zf.write(p, arcname=str(p.relative_to(dir_path)))
-        return buf.getvalue()
+
+def _zip_dir_to_bytes(dir_path: Path, compresslevel: int = 6) -> bytes:
+    """
+    Zip a directory and return raw bytes. Small archives stay in memory,
+    large ones are spooled to a temp file until read back.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES) as buf:
+        with zipfile.ZipFile(
+            buf, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        ) as zf:
+            for path, arcname in _iter_files(dir_path):
+                zf.write(path, arcname=arcname)
+        buf.seek(0)
+        return buf.read()
+
+
+def _zip_dir_to_file(dir_path: Path, dest: Path, compresslevel: int = 6) -> Path:
+    """
+    Zip a directory straight to dest on disk, so memory use stays flat.
+    """
+    with zipfile.ZipFile(
+        dest, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+    ) as zf:
+        for path, arcname in _iter_files(dir_path):
+            zf.write(path, arcname=arcname)
+    return dest
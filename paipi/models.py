@@ -69,6 +69,9 @@ class PackageFile(BaseModel):
 class SearchResult(BaseModel):
     """Individual search result matching PyPI format."""
 
+    # Cached responses share these instances; derive changes with model_copy
+    model_config = ConfigDict(frozen=True)
+
     name: str
     version: str
     # Use Field to provide a distinct description for this field in OpenAPI docs
@@ -125,7 +128,6 @@ class SearchResponse(BaseModel):
 
     info: Dict[str, Any] = Field(default_factory=dict)
     results: List[SearchResult] = Field(default_factory=list)
-    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
 
 
 class ReadmeRequest(BaseModel):
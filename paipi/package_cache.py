@@ -8,18 +8,100 @@ to verify if a package name is legitimate.
 
 from __future__ import annotations
 
-import re
+import logging
+import marshal
+import secrets
 import sqlite3
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
 from pathlib import Path
-from typing import Set
+from typing import Iterable, Iterator, Sequence
 
 import httpx
 
 from .package_names import canonicalize_package_name
 
+logger = logging.getLogger(__name__)
+
 # --- Constants ---
 CACHE_DB_PATH = Path("paipi_cache.db")
 PYPI_SIMPLE_URL = "https://pypi.org/simple/"
+# The index is hundreds of MB of HTML; it is parsed as it arrives, in chunks.
+SIMPLE_CHUNK_BYTES = 64 * 1024
+_SIMPLE_HREF = b'<a href="/simple/'
+# For the bulk rewrite: a 64 MiB page cache keeps the primary-key B-tree being
+# built in memory, and sorting/temp data never touches disk.
+WRITER_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _iter_simple_names(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Yield package names from Simple index HTML received in chunks."""
+    # Every entry is <a href="/simple/NAME/">; plain bytes.find (memchr-based)
+    # locates them faster than a regex walking every byte
+    prefix_len = len(_SIMPLE_HREF)
+    tail = b""
+    for chunk in chunks:
+        buf = tail + chunk
+        pos = buf.find(_SIMPLE_HREF)
+        while pos != -1:
+            start = pos + prefix_len
+            end = buf.find(b'/">', start)
+            if end == -1:
+                break  # the tag continues in the next chunk
+            yield buf[start:end].decode()
+            pos = buf.find(_SIMPLE_HREF, end)
+        # Carry an unfinished tag, or enough bytes to complete a split prefix
+        tail = buf[pos:] if pos != -1 else buf[1 - prefix_len :]
+
+
+class _NameIndex(Sequence[str]):
+    """Sorted, unique package names packed into one string.
+
+    A set of ~600k names costs tens of MB in per-object overhead; one ASCII
+    string plus an array of offsets is a fraction of that, and membership is
+    a binary search (about 20 slices) instead of a hash lookup.
+    """
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, sorted_names: Iterable[str] = ()) -> None:
+        names = list(sorted_names)
+        self._blob = "".join(names)
+        self._offsets = array("I", accumulate(map(len, names), initial=0))
+
+    @classmethod
+    def from_parts(cls, blob: str, offsets: bytes) -> _NameIndex:
+        """Rebuild an index from the output of ``parts()``."""
+        index = cls()
+        index._blob = blob
+        index._offsets = array("I", offsets)
+        return index
+
+    def parts(self) -> tuple[str, bytes]:
+        """The packed form, suitable for marshal."""
+        return self._blob, self._offsets.tobytes()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self._blob[self._offsets[i] : self._offsets[i + 1]]
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        i = bisect_left(self, name)
+        return i < len(self) and self[i] == name
 
 
 class PackageCache:
@@ -28,7 +110,9 @@ class PackageCache:
     _instance = None
     _db_path: Path
     _connection: sqlite3.Connection | None = None
-    _package_names: Set[str] | None = None
+    # PEP 503-normalized names; immutable, so threads can share it unlocked
+    _package_names: _NameIndex | None = None
+    _load_lock = threading.Lock()
 
     def __new__(cls, db_path: Path = CACHE_DB_PATH) -> PackageCache:
         if cls._instance is None:
@@ -37,11 +121,63 @@ class PackageCache:
             cls._instance._init_db()
         return cls._instance
 
+    @property
+    def _snapshot_path(self) -> Path:
+        """Side file next to the DB: (generation, *_NameIndex.parts()), marshaled."""
+        return self._db_path.with_suffix(".marshal")
+
+    @staticmethod
+    def _read_generation(connection: sqlite3.Connection) -> str | None:
+        """Token that update_cache() replaces each time it changes the index."""
+        cursor = connection.cursor()
+        cursor.execute("SELECT value FROM cache_meta WHERE key = 'generation'")
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _read_snapshot(self) -> _NameIndex | None:
+        """Load the name set from the snapshot, if it matches the DB's generation."""
+        if not self._connection:
+            return None
+        snapshot = self._snapshot_path
+        try:
+            # File mtimes cannot tell: opening or checkpointing the WAL DB
+            # touches its files after the snapshot is written
+            generation = self._read_generation(self._connection)
+            if generation is None:
+                return None
+            data = snapshot.read_bytes()
+        except FileNotFoundError:
+            return None
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Ignoring package snapshot {snapshot}: {e}")
+            return None
+        try:
+            snapshot_generation, blob, offsets = marshal.loads(data)
+            if snapshot_generation != generation:
+                return None
+            return _NameIndex.from_parts(blob, offsets)
+        except (EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable package snapshot {snapshot}: {e}")
+            return None
+
+    def _write_snapshot(self, names: _NameIndex, generation: str) -> None:
+        """Dump the name set so the next start can skip the SELECT."""
+        snapshot = self._snapshot_path
+        tmp = snapshot.with_name(snapshot.name + ".tmp")
+        try:
+            tmp.write_bytes(marshal.dumps((generation, *names.parts())))
+            tmp.replace(snapshot)
+        except OSError as e:
+            logger.warning(f"Could not write package snapshot {snapshot}: {e}")
+
     def _init_db(self) -> None:
         """Initialize the database and table if they don't exist."""
         try:
             # check_same_thread=False is safe for this read-heavy, single-writer use case
             self._connection = sqlite3.connect(self._db_path, check_same_thread=False)
+            # WAL: the background update_cache() write does not block readers
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
             cursor = self._connection.cursor()
             cursor.execute(
                 """
@@ -51,35 +187,53 @@ class PackageCache:
                                TEXT
                                PRIMARY
                                KEY
-                           )
+                           ) WITHOUT ROWID
                            """
             )
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
             self._connection.commit()
-            print(f"Cache database initialized at {self._db_path}")
+            logger.info(f"Cache database initialized at {self._db_path}")
         except sqlite3.Error as e:
-            print(f"Database error during initialization: {e}")
+            logger.error(f"Database error during initialization: {e}")
             self._connection = None
 
     def load_into_memory(self) -> None:
         """Load all package names from DB into a set for fast lookups."""
         if self._package_names is not None:
             return  # Already loaded
-        if self._connection:
-            try:
-                print("Loading package names from database into memory...")
-                cursor = self._connection.cursor()
-                cursor.execute("SELECT name FROM packages")
-                self._package_names = {
-                    canonicalize_package_name(row[0]) for row in cursor.fetchall()
-                }
-                print(
-                    f"Loaded {len(self._package_names)} package names into memory cache."
-                )
-            except sqlite3.Error as e:
-                print(f"Database error loading names into memory: {e}")
-                self._package_names = set()
-        else:
-            self._package_names = set()
+        # Lookups run on worker threads; only the first of them loads the set
+        with self._load_lock:
+            if self._package_names is not None:
+                return
+            # One marshal.loads is several times faster than iterating the
+            # table and building the index row by row
+            names = self._read_snapshot()
+            if names is not None:
+                self._package_names = names
+                logger.info(f"Loaded {len(names)} package names from snapshot.")
+                return
+            if self._connection:
+                try:
+                    logger.info("Loading package names from database into memory...")
+                    names = self._read_names(self._connection)
+                    self._package_names = names
+                    logger.info(f"Loaded {len(names)} package names into memory cache.")
+                except sqlite3.Error as e:
+                    logger.error(f"Database error loading names into memory: {e}")
+                    self._package_names = _NameIndex()
+            else:
+                self._package_names = _NameIndex()
+
+    @staticmethod
+    def _read_names(connection: sqlite3.Connection) -> _NameIndex:
+        """Read every package name; they are stored already normalized."""
+        cursor = connection.cursor()
+        # The primary key already keeps names in this order; no sort is needed
+        cursor.execute("SELECT name FROM packages ORDER BY name")
+        return _NameIndex(row[0] for row in cursor)
 
     def has_data(self) -> bool:
         """Check if the cache contains any package data."""
@@ -92,60 +246,106 @@ class PackageCache:
             result = cursor.fetchone()
             return result[0] == 1 if result else False
         except sqlite3.Error as e:
-            print(f"Database error checking for data: {e}")
+            logger.error(f"Database error checking for data: {e}")
             return False
 
     def update_cache(self) -> None:
         """Fetch all package names from PyPI and update the local SQLite cache."""
         if not self._connection:
-            print("Cannot update cache: database connection not available.")
+            logger.error("Cannot update cache: database connection not available.")
             return
 
-        print("Starting PyPI package list update from server...")
+        logger.info("Starting PyPI package list update from server...")
+        # A separate connection, so lookups on the shared one keep reading the
+        # last committed index (WAL) while this transaction is open
         try:
-            with httpx.Client() as client:
-                response = client.get(PYPI_SIMPLE_URL, timeout=120.0)
-                response.raise_for_status()
+            writer = sqlite3.connect(self._db_path)
+            for pragma in WRITER_PRAGMAS:
+                writer.execute(pragma)
+        except sqlite3.Error as e:
+            logger.error(f"Database error during cache update: {e}")
+            return
+        try:
+            cursor = writer.cursor()
 
-            # Regex to find package names in the href attributes of the simple index
-            package_names = re.findall(r'<a href="/simple/([^/]+)/">', response.text)
+            # Use a transaction for much faster inserts
+            cursor.execute("BEGIN TRANSACTION")
+            # Stage the fresh index, then apply only the difference, so the
+            # unchanged majority of rows is never deleted and rewritten
+            cursor.execute(
+                "CREATE TEMP TABLE new_packages (name TEXT PRIMARY KEY) WITHOUT ROWID"
+            )
+            with httpx.Client() as client:
+                with client.stream("GET", PYPI_SIMPLE_URL, timeout=120.0) as resp:
+                    resp.raise_for_status()
+                    # Names are parsed and inserted while the index downloads
+                    names = _iter_simple_names(resp.iter_bytes(SIMPLE_CHUNK_BYTES))
+                    # Normalized once here, so loading the set needs no work
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO new_packages (name) VALUES (?)",
+                        ((canonicalize_package_name(name),) for name in names),
+                    )
+            total = cursor.rowcount
 
-            if not package_names:
-                print("Could not find any package names. Aborting cache update.")
+            if total <= 0:
+                writer.rollback()
+                logger.error("Could not find any package names. Aborting cache update.")
                 return
 
-            cursor = self._connection.cursor()
-
-            # Use a transaction for much faster inserts
-            cursor.execute("BEGIN TRANSACTION")
-            cursor.execute("DELETE FROM packages")  # Clear old data
-            cursor.executemany(
-                "INSERT OR IGNORE INTO packages (name) VALUES (?)",
-                [(name,) for name in package_names],
+            cursor.execute(
+                "INSERT OR IGNORE INTO packages (name) SELECT name FROM new_packages"
+            )
+            added = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM packages WHERE name NOT IN (SELECT name FROM new_packages)"
+            )
+            removed = cursor.rowcount
+            cursor.execute("DROP TABLE new_packages")
+            # A fresh random token, so a snapshot left over from a deleted DB
+            # can never match the new one
+            generation = secrets.token_hex(8)
+            cursor.execute(
+                "INSERT OR REPLACE INTO cache_meta (key, value) "
+                "VALUES ('generation', ?)",
+                (generation,),
             )
             cursor.execute("COMMIT")
 
-            print(f"Successfully updated cache with {len(package_names)} packages.")
-            self._package_names = None  # Force reload on next check
-            self.load_into_memory()  # Refresh in-memory set
+            logger.info(
+                f"Successfully updated cache with {total} packages "
+                f"({added} added, {removed} removed)."
+            )
+            # Swap in the refreshed index in one step; lookups never see it empty
+            self._package_names = self._read_names(writer)
+            self._write_snapshot(self._package_names, generation)
 
-        except httpx.RequestError as e:
-            print(f"HTTP error while fetching package list: {e}")
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error while fetching package list: {e}")
+            writer.rollback()
         except sqlite3.Error as e:
-            print(f"Database error during cache update: {e}")
-            if self._connection:
-                self._connection.rollback()
+            logger.error(f"Database error during cache update: {e}")
+            writer.rollback()
         except Exception as e:
-            print(f"An unexpected error occurred during cache update: {e}")
+            logger.error(f"An unexpected error occurred during cache update: {e}")
+            writer.rollback()
+        finally:
+            writer.close()
+
+    def is_loaded(self) -> bool:
+        """True once a non-empty package index is held in memory."""
+        return bool(self._package_names)
 
     def package_exists(self, package_name: str) -> bool:
         """Check if a package exists in the cache (case-insensitive and normalized)."""
+        # Normalizing is far cheaper than a second binary search on a miss
+        return self.package_exists_normalized(canonicalize_package_name(package_name))
+
+    def package_exists_normalized(self, normalized_name: str) -> bool:
+        """Check a name that is already PEP 503-normalized, skipping that step."""
         if self._package_names is None:
             self.load_into_memory()
-
-        normalized_name = canonicalize_package_name(package_name)
-
-        return normalized_name in self._package_names if self._package_names else False
+        names = self._package_names
+        return bool(names) and normalized_name in names
 
     def close(self) -> None:
         """Closes the database connection."""
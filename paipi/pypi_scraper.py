@@ -4,17 +4,27 @@ PyPI Scraper client for fetching package metadata from the official JSON API.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, cast
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
 
 import httpx
 from pydantic import ValidationError
 
+try:
+    # Optional: parses large release histories several times faster
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - depends on the environment
+    from json import loads as _json_loads  # type: ignore[assignment]
+
 from .models import (
     PackageFile,
     PackageRelease,
     ProjectDetails,
-    ProjectUrls,
 )
 
 # Set up a logger for this module, following existing patterns.
@@ -32,6 +42,45 @@ class PypiScraper:
         """Initialize the scraper client."""
         self.base_url = "https://pypi.org/pypi"
         self.timeout = 30.0
+        self.max_connections = 20
+        self._client: Optional[httpx.AsyncClient] = None
+        # Recent metadata, revalidated with its ETag once older than the TTL.
+        # Payloads can be megabytes (long release histories), so keep it small.
+        self.metadata_ttl = 300.0
+        self.metadata_cache_size = 128
+        self._metadata_cache: OrderedDict[
+            Tuple[str, Optional[str]], Tuple[float, Optional[str], Dict[str, Any]]
+        ] = OrderedDict()
+        # One fetch per (name, version); concurrent callers share its result
+        self._inflight: Dict[
+            Tuple[str, Optional[str]], asyncio.Task[Optional[Dict[str, Any]]]
+        ] = {}
+
+    async def open(self) -> None:
+        """Start a shared, pooled HTTP client reused by every request."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a one-off client when none is open."""
+        if self._client is not None:
+            yield self._client
+            return
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            yield client
 
     def _build_metadata_url(
         self, package_name: str, version: Optional[str] = None
@@ -47,6 +96,9 @@ class PypiScraper:
         """
         Fetches the raw JSON metadata for a package from PyPI.
 
+        Recent results are served from memory, and concurrent requests for the
+        same package share a single HTTP request.
+
         Args:
             package_name: The name of the package.
             version: Optional specific version of the package. If None, gets latest.
@@ -54,14 +106,40 @@ class PypiScraper:
         Returns:
             A dictionary with the raw package metadata, or None if not found.
         """
+        key = (package_name, version)
+        cached = self._metadata_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._metadata_cache.move_to_end(key)
+            return cached[2]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_metadata(package_name, version, cached)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _done: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_metadata(
+        self,
+        package_name: str,
+        version: Optional[str],
+        cached: Optional[Tuple[float, Optional[str], Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """GET the metadata, revalidating an expired cache entry by ETag."""
         url = self._build_metadata_url(package_name, version)
+        headers = {"If-None-Match": cached[1]} if cached and cached[1] else {}
         try:
             scraper_logger.info(
                 f"Fetching metadata for '{package_name}'"
                 f"{' version ' + version if version else ' (latest)'}..."
             )
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
+            async with self._session() as client:
+                response = await client.get(url, headers=headers)
+                if response.status_code == 304 and cached:
+                    self._remember(package_name, version, cached[1], cached[2])
+                    return cached[2]
                 if response.status_code == 404:
                     scraper_logger.warning(
                         f"Package '{package_name}'"
@@ -69,7 +147,11 @@ class PypiScraper:
                     )
                     return None
                 response.raise_for_status()
-                return cast(Dict[str, Any], response.json())
+                metadata = cast(Dict[str, Any], _json_loads(response.content))
+                self._remember(
+                    package_name, version, response.headers.get("etag"), metadata
+                )
+                return metadata
 
         except httpx.HTTPStatusError as e:
             scraper_logger.error(
@@ -91,6 +173,24 @@ class PypiScraper:
             )
             return None
 
+    def _remember(
+        self,
+        package_name: str,
+        version: Optional[str],
+        etag: Optional[str],
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Cache metadata for metadata_ttl seconds, evicting the oldest entry."""
+        key = (package_name, version)
+        self._metadata_cache[key] = (
+            time.monotonic() + self.metadata_ttl,
+            etag,
+            metadata,
+        )
+        self._metadata_cache.move_to_end(key)
+        if len(self._metadata_cache) > self.metadata_cache_size:
+            self._metadata_cache.popitem(last=False)
+
     async def get_project_details(self, package_name: str) -> Optional[ProjectDetails]:
         """
         Fetches detailed information for the latest version of a package.
@@ -108,25 +208,11 @@ class PypiScraper:
 
         info = metadata["info"]
         try:
-            project_urls_data = info.get("project_urls")
-            project_urls = (
-                ProjectUrls(**project_urls_data) if project_urls_data else None
-            )
-
-            details = ProjectDetails(
-                author=info.get("author"),
-                author_email=info.get("author_email"),
-                maintainer=info.get("maintainer"),
-                maintainer_email=info.get("maintainer_email"),
-                license=info.get("license"),
-                keywords=info.get("keywords"),
-                classifiers=info.get("classifiers", []),
-                requires_python=info.get("requires_python"),
-                project_urls=project_urls,
-                summary=info.get("summary"),
-                platform=info.get("platform"),
+            # Validate the raw info dict in one pass; fields the model does not
+            # declare are ignored. An empty project_urls stays None, as before.
+            return ProjectDetails.model_validate(
+                {**info, "project_urls": info.get("project_urls") or None}
             )
-            return details
         except ValidationError as e:
             scraper_logger.error(
                 f"Pydantic validation failed for '{package_name}': {e}"
@@ -167,20 +253,25 @@ class PypiScraper:
             return []
 
         releases = []
+        append = releases.append
         for version, release_files in metadata["releases"].items():
             if not release_files:
                 continue
 
-            is_yanked = all(f.get("yanked", False) for f in release_files)
-            yanked_reason = release_files[0].get("yanked_reason") if is_yanked else None
-            upload_time = release_files[0].get("upload_time_iso_8601")
+            first = release_files[0]
+            # A release is yanked only if every file is; stop at the first that isn't
+            is_yanked = True
+            for f in release_files:
+                if not f.get("yanked", False):
+                    is_yanked = False
+                    break
 
-            releases.append(
+            append(
                 PackageRelease(
                     version=version,
                     yanked=is_yanked,
-                    yanked_reason=yanked_reason,
-                    upload_time=upload_time,
+                    yanked_reason=first.get("yanked_reason") if is_yanked else None,
+                    upload_time=first.get("upload_time_iso_8601"),
                 )
             )
         return releases
@@ -206,25 +297,31 @@ class PypiScraper:
 
         # The files are under the 'urls' key in the JSON response
         files_data = metadata.get("urls", [])
-        package_files = []
         try:
-            for file_info in files_data:
-                package_files.append(
-                    PackageFile(
-                        filename=file_info.get("filename"),
-                        url=file_info.get("url"),
-                        hashes=file_info.get("digests", {}),
-                        requires_python=file_info.get("requires_python"),
-                        yanked=file_info.get("yanked", False),
-                        yanked_reason=file_info.get("yanked_reason"),
-                        upload_time=file_info.get("upload_time_iso_8601"),
-                        size=file_info.get("size"),
-                        packagetype=file_info.get("packagetype", "sdist"),
-                    )
-                )
-            return package_files
-        except ValidationError as e:
+            return [_to_package_file(file_info) for file_info in files_data]
+        except (KeyError, TypeError, ValueError) as e:
             scraper_logger.error(
-                f"Pydantic validation failed for files of '{package_name}': {e}"
+                f"Could not read release files of '{package_name}': {e}"
             )
             return []
+
+
+def _to_package_file(file_info: Dict[str, Any]) -> PackageFile:
+    """
+    Build a PackageFile from one entry of PyPI's "urls" list.
+
+    PyPI's file entries have a fixed shape, so the model is constructed
+    without running validation; only the upload time needs parsing.
+    """
+    upload_time = file_info.get("upload_time_iso_8601")
+    return PackageFile.model_construct(
+        filename=file_info["filename"],
+        url=file_info["url"],
+        hashes=file_info.get("digests") or {},
+        requires_python=file_info.get("requires_python"),
+        yanked=file_info.get("yanked", False),
+        yanked_reason=file_info.get("yanked_reason"),
+        upload_time=datetime.fromisoformat(upload_time) if upload_time else None,
+        size=file_info.get("size"),
+        packagetype=file_info.get("packagetype", "sdist"),
+    )
@@ -74,25 +74,26 @@ async def run_quick_evaluation(
     evaluation_engine = EvaluationEngine(config)
     analyzer = ResultsAnalyzer(config)
 
-    all_results = []
-
-    # Run mixed package evaluation
-    logger.info("Running mixed package evaluation...")
     mixed_test_cases = test_generator.generate_mixed_test(config.test_package_count)
-    mixed_results = await evaluation_engine.run_mixed_package_evaluation(models, mixed_test_cases)
-    all_results.extend(mixed_results)
-
-    # Run topic evaluations
-    for topic in topics:
-        logger.info(f"Running topic evaluation for: {topic}")
-        topic_results = await evaluation_engine.run_topic_generation_evaluation(models, topic, all_packages)
-        all_results.extend(topic_results)
-
-    # Run fake detection
-    logger.info("Running fake package detection...")
     fake_packages = test_generator.generate_fake_test(config.test_package_count)
-    fake_results = await evaluation_engine.run_fake_detection_evaluation(models, fake_packages)
-    all_results.extend(fake_results)
+
+    # The stages are independent network calls; run them concurrently. The
+    # engine's client semaphore still caps requests at max_concurrent_requests.
+    logger.info("Running mixed, topic and fake package evaluations...")
+    try:
+        stage_results = await asyncio.gather(
+            evaluation_engine.run_mixed_package_evaluation(models, mixed_test_cases),
+            *(
+                evaluation_engine.run_topic_generation_evaluation(
+                    models, topic, all_packages
+                )
+                for topic in topics
+            ),
+            evaluation_engine.run_fake_detection_evaluation(models, fake_packages),
+        )
+    finally:
+        await evaluation_engine.client.aclose()
+    all_results = [result for stage in stage_results for result in stage]
 
     # Analyze results
     logger.info("Creating visualizations...")
@@ -107,9 +108,13 @@ async def run_quick_evaluation(
 
     summary_df = analyzer.create_summary_report(all_results)
 
-    # Group by model and show average performance
+    # Group by model once (hash aggregation) instead of re-masking per model
+    by_model = dict(tuple(summary_df.groupby('model', sort=False)))
+    no_results = summary_df.iloc[0:0]
+
+    # Show average performance per model, in the order requested
     for model in models:
-        model_results = summary_df[summary_df['model'] == model]
+        model_results = by_model.get(model, no_results)
         avg_success = model_results['success_rate'].mean()
         print(f"\n{model}: {avg_success:.2%} average success rate")
 
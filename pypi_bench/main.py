@@ -10,19 +10,53 @@ import hashlib
 import json
 import logging
 import pickle
+import pickletools
 import random
 import re
 import time
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import accumulate
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 
 import aiohttp
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
+# Plots are only ever written to files; never load an interactive backend
+matplotlib.use('Agg')
+
+SIMPLE_CHUNK_BYTES = 64 * 1024
+# Leading "1." numbering and then a "-"/"*" bullet, in one pass
+_LIST_PREFIX_RE = re.compile(r'^(?:\d+\.?\s*)?(?:[-*]\s*)?')
+_TRUE_ANSWERS = frozenset({'true', 'yes', '1', 'real'})
+_ANCHOR_START = b'<a href="'
+
+
+def _scan_anchor_texts(buf: bytes, names: Set[str]) -> bytes:
+    """Add the text of every complete <a href="...">NAME</a> in buf to names.
+
+    Returns the unscanned tail, to be prepended to the next chunk.
+    """
+    pos = buf.find(_ANCHOR_START)
+    while pos != -1:
+        text_start = buf.find(b'">', pos)
+        if text_start == -1:
+            break
+        text_end = buf.find(b'</a>', text_start)
+        if text_end == -1:
+            break
+        if text_end > text_start + 2:
+            names.add(buf[text_start + 2:text_end].decode())
+        pos = buf.find(_ANCHOR_START, text_end)
+    # Keep an unfinished tag, or enough bytes to complete a split tag start
+    return buf[pos:] if pos != -1 else buf[1 - len(_ANCHOR_START):]
+
 
 # Configuration
 @dataclass
@@ -107,48 +141,78 @@ class PackageIndexManager:
 
     def _save_cache(self, packages: Set[str]) -> None:
         """Save package index to cache."""
+        # Written once per TTL but read on every run: spend the extra second
+        # dropping unused memo opcodes so each load has less to parse
+        data = pickle.dumps(packages, protocol=pickle.HIGHEST_PROTOCOL)
         with open(self.cache_file, 'wb') as f:
-            pickle.dump(packages, f)
+            f.write(pickletools.optimize(data))
 
     async def _download_packages(self) -> Set[str]:
         """Download all package names from PyPI."""
         url = "https://pypi.org/simple/"
+        packages: Set[str] = set()
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
                 if response.status != 200:
                     raise RuntimeError(f"Failed to fetch PyPI index: {response.status}")
 
-                html = await response.text()
-                # Extract package names from the simple API HTML
-                import re
-                pattern = r'<a href="[^"]*">([^<]+)</a>'
-                matches = re.findall(pattern, html)
-                return set(matches)
+                # Scan the simple API HTML as it arrives instead of holding
+                # the whole page and a list of regex matches in memory
+                tail = b""
+                async for chunk in response.content.iter_chunked(SIMPLE_CHUNK_BYTES):
+                    tail = _scan_anchor_texts(tail + chunk, packages)
+        return packages
 
 
 class ResponseCache:
-    """Caches LLM responses to avoid duplicate API calls."""
+    """Caches LLM responses to avoid duplicate API calls.
+
+    Entries are appended to a JSON Lines journal, one line per response, so a
+    new response costs one small write instead of rewriting the whole cache.
+    The journal is compacted when it is loaded.
+    """
 
     def __init__(self, config: Config) -> None:
         self.config = config
-        self.cache_file = config.cache_dir / "response_cache.json"
+        self.cache_file = config.cache_dir / "response_cache.jsonl"
         self.cache: Dict[str, Dict] = self._load_cache()
 
     def _load_cache(self) -> Dict[str, Dict]:
-        """Load existing cache."""
+        """Replay the journal; later lines win over earlier ones."""
         if not self.cache_file.exists():
             return {}
 
-        try:
-            with open(self.cache_file) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
-
-    def _save_cache(self) -> None:
-        """Save cache to disk."""
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache, f, indent=2, default=str)
+        cache: Dict[str, Dict] = {}
+        lines = 0
+        with open(self.cache_file) as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    cache[entry.pop('key')] = entry
+                except (json.JSONDecodeError, KeyError, AttributeError):
+                    continue  # e.g. a line torn by an interrupted run
+
+        # Drop superseded and expired lines so the journal does not grow forever
+        live = {
+            key: entry for key, entry in cache.items() if not self._is_expired(entry)
+        }
+        if lines > len(live):
+            self._save_cache(live)
+        return live
+
+    def _save_cache(self, cache: Dict[str, Dict]) -> None:
+        """Rewrite the journal with only the given entries."""
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            for key, entry in cache.items():
+                f.write(json.dumps({'key': key, **entry}, default=str) + '\n')
+        tmp_file.replace(self.cache_file)
+
+    def _is_expired(self, entry: Dict) -> bool:
+        """Check whether an entry is older than the response cache TTL."""
+        cache_time = datetime.fromisoformat(entry['timestamp'])
+        return datetime.now() - cache_time > self.config.response_cache_ttl
 
     def _make_key(self, model: str, prompt: str, temperature: float = 0.0) -> str:
         """Create cache key from model and prompt."""
@@ -163,9 +227,7 @@ class ResponseCache:
             return None
 
         entry = self.cache[key]
-        cache_time = datetime.fromisoformat(entry['timestamp'])
-
-        if datetime.now() - cache_time > self.config.response_cache_ttl:
+        if self._is_expired(entry):
             del self.cache[key]
             return None
 
@@ -174,12 +236,14 @@ class ResponseCache:
     def set(self, model: str, prompt: str, response: str, temperature: float = 0.0) -> None:
         """Cache a response."""
         key = self._make_key(model, prompt, temperature)
-        self.cache[key] = {
+        entry = {
             'response': response,
             'timestamp': datetime.now().isoformat(),
             'model': model
         }
-        self._save_cache()
+        self.cache[key] = entry
+        with open(self.cache_file, 'a') as f:
+            f.write(json.dumps({'key': key, **entry}, default=str) + '\n')
 
 
 class OpenRouterClient:
@@ -190,6 +254,24 @@ class OpenRouterClient:
         self.cache = ResponseCache(config)
         self.logger = logging.getLogger(__name__)
         self.semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+        # One session for every request, so connections (and their TLS
+        # handshakes) are kept alive and reused
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_concurrent_requests * 2, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def query_model(
         self,
@@ -198,16 +280,32 @@ class OpenRouterClient:
         temperature: float = 0.0
     ) -> str:
         """Query a model with caching."""
+        response, _ = await self.query_model_timed(model, prompt, temperature)
+        return response
+
+    async def query_model_timed(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.0
+    ) -> Tuple[str, float]:
+        """Query a model with caching, also returning the request's duration.
+
+        The duration excludes time spent waiting for a free request slot, so
+        it stays comparable when many queries run concurrently.
+        """
         # Check cache first
         cached_response = self.cache.get(model, prompt, temperature)
         if cached_response:
-            return cached_response
+            return cached_response, 0.0
 
         # Make API request
         async with self.semaphore:
+            start_time = time.time()
             response = await self._make_api_request(model, prompt, temperature)
+            request_time = time.time() - start_time
             self.cache.set(model, prompt, response, temperature)
-            return response
+            return response, request_time
 
     async def _make_api_request(
         self,
@@ -227,23 +325,23 @@ class OpenRouterClient:
             "temperature": temperature
         }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{self.config.openrouter_base_url}/chat/completions",
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise RuntimeError(f"API error {response.status}: {error_text}")
+        session = await self._get_session()
+        try:
+            async with session.post(
+                f"{self.config.openrouter_base_url}/chat/completions",
+                headers=headers,
+                json=data,
+                timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(f"API error {response.status}: {error_text}")
 
-                    result = await response.json()
-                    return result["choices"][0]["message"]["content"]
+                result = await response.json()
+                return result["choices"][0]["message"]["content"]
 
-            except asyncio.TimeoutError:
-                raise RuntimeError(f"Timeout querying {model}")
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timeout querying {model}")
 
 
 class PackageTestGenerator:
@@ -252,6 +350,20 @@ class PackageTestGenerator:
     def __init__(self, package_index: Set[str]) -> None:
         self.all_packages = package_index
         self.real_packages = list(package_index)
+        self._lowered_names: Optional[Tuple[str, array]] = None
+        self._keyword_matches: Dict[Tuple[str, ...], List[str]] = {}
+
+    def _get_lowered_names(self) -> Tuple[str, array]:
+        """All real package names lowercased once, joined by newlines.
+
+        Returned with the offset each name starts at (plus one past the end),
+        so a match position maps back to an index into real_packages.
+        """
+        if self._lowered_names is None:
+            lowered = [pkg.lower() for pkg in self.real_packages]
+            starts = array('q', accumulate((len(name) + 1 for name in lowered), initial=0))
+            self._lowered_names = ('\n'.join(lowered), starts)
+        return self._lowered_names
 
     def generate_mixed_test(self, count: int = 25) -> List[Tuple[str, bool]]:
         """Generate mixed real/fake packages test."""
@@ -277,11 +389,8 @@ class PackageTestGenerator:
         """Generate real packages related to a topic."""
         topic_keywords = self._get_topic_keywords(topic)
 
-        # Find packages that contain topic-related keywords
-        related_packages = []
-        for pkg in self.real_packages:
-            if any(keyword in pkg.lower() for keyword in topic_keywords):
-                related_packages.append(pkg)
+        # Copy: the popular-package fallback below appends to it
+        related_packages = list(self._find_keyword_matches(tuple(topic_keywords)))
 
         # If we don't have enough, add some popular packages
         if len(related_packages) < count:
@@ -299,6 +408,24 @@ class PackageTestGenerator:
 
         return random.sample(related_packages, min(count, len(related_packages)))
 
+    def _find_keyword_matches(self, keywords: Tuple[str, ...]) -> List[str]:
+        """Real packages whose lowercased name contains any of the keywords.
+
+        Memoized per keyword set, since every call samples the same matches.
+        """
+        if keywords not in self._keyword_matches:
+            # str.find over the joined, pre-lowered names, one pass per keyword
+            names, starts = self._get_lowered_names()
+            matched = set()
+            for keyword in keywords:
+                pos = names.find(keyword)
+                while pos != -1:
+                    index = bisect_right(starts, pos) - 1
+                    matched.add(index)
+                    pos = names.find(keyword, starts[index + 1])
+            self._keyword_matches[keywords] = [self.real_packages[i] for i in sorted(matched)]
+        return self._keyword_matches[keywords]
+
     def generate_fake_test(self, count: int = 25) -> List[str]:
         """Generate obviously fake package names."""
         return self._generate_fake_packages(count)
@@ -322,6 +449,7 @@ class PackageTestGenerator:
         words = ['parser', 'handler', 'manager', 'helper', 'wrapper', 'builder']
 
         fake_packages = []
+        seen: Set[str] = set()
         while len(fake_packages) < count:
             # Generate different types of fake names
             if random.random() < 0.3:
@@ -337,7 +465,8 @@ class PackageTestGenerator:
                 name = ''.join(random.choices(consonants + vowels, k=random.randint(6, 12)))
 
             # Make sure it's not a real package and not already in our fake list
-            if name not in self.all_packages and name not in fake_packages:
+            if name not in self.all_packages and name not in seen:
+                seen.add(name)
                 fake_packages.append(name)
 
         return fake_packages
@@ -372,25 +501,24 @@ CSV Response:
         package_names = [pkg for pkg, _ in test_cases]
         prompt = prompt_template.format(packages='\n'.join(package_names))
 
-        results = []
-        for model in models:
+        async def evaluate(model: str) -> EvaluationResult:
             self.logger.info(f"Evaluating {model} on mixed package test")
             start_time = time.time()
 
             try:
-                response = await self.client.query_model(model, prompt)
+                response, request_time = await self.client.query_model_timed(model, prompt)
+                parse_start = time.time()
                 parsed = self._parse_csv_response(response, package_names)
 
-                # Calculate accuracy
-                correct = 0
+                # Calculate accuracy; zip stops at the shorter of the two lists
                 ground_truth = [{'package': pkg, 'is_real': is_real} for pkg, is_real in test_cases]
-
-                for i, (pkg, expected) in enumerate(test_cases):
-                    if i < len(parsed) and parsed[i].get('is_real') == expected:
-                        correct += 1
+                correct = sum(
+                    item.get('is_real') == expected
+                    for item, (_, expected) in zip(parsed, test_cases)
+                )
 
                 success_rate = correct / len(test_cases)
-                execution_time = time.time() - start_time
+                execution_time = request_time + time.time() - parse_start
 
                 result = EvaluationResult(
                     model_name=model,
@@ -405,8 +533,8 @@ CSV Response:
                     execution_time=execution_time
                 )
 
-                results.append(result)
                 self.logger.info(f"{model}: {success_rate:.2%} accuracy")
+                return result
 
             except Exception as e:
                 self.logger.error(f"Error evaluating {model}: {e}")
@@ -423,9 +551,10 @@ CSV Response:
                     execution_time=time.time() - start_time,
                     errors=[str(e)]
                 )
-                results.append(result)
+                return result
 
-        return results
+        # Each model is independent; the client semaphore bounds the requests
+        return list(await asyncio.gather(*(evaluate(model) for model in models)))
 
     async def run_topic_generation_evaluation(
         self,
@@ -447,19 +576,19 @@ package3
 Package names:
         """
 
-        results = []
-        for model in models:
+        async def evaluate(model: str) -> EvaluationResult:
             self.logger.info(f"Evaluating {model} on topic generation: {topic}")
             start_time = time.time()
 
             try:
-                response = await self.client.query_model(model, prompt)
+                response, request_time = await self.client.query_model_timed(model, prompt)
+                parse_start = time.time()
                 package_names = self._parse_list_response(response)
 
                 # Check how many are real packages
                 correct = sum(1 for pkg in package_names if pkg in ground_truth_packages)
                 success_rate = correct / len(package_names) if package_names else 0
-                execution_time = time.time() - start_time
+                execution_time = request_time + time.time() - parse_start
 
                 parsed_responses = [{'package': pkg, 'is_real': pkg in ground_truth_packages}
                                   for pkg in package_names]
@@ -478,8 +607,8 @@ Package names:
                     execution_time=execution_time
                 )
 
-                results.append(result)
                 self.logger.info(f"{model}: {success_rate:.2%} real packages for {topic}")
+                return result
 
             except Exception as e:
                 self.logger.error(f"Error evaluating {model}: {e}")
@@ -496,9 +625,10 @@ Package names:
                     execution_time=time.time() - start_time,
                     errors=[str(e)]
                 )
-                results.append(result)
+                return result
 
-        return results
+        # Each model is independent; the client semaphore bounds the requests
+        return list(await asyncio.gather(*(evaluate(model) for model in models)))
 
     async def run_fake_detection_evaluation(
         self,
@@ -521,19 +651,19 @@ CSV Response:
 
         prompt = prompt_template.format(packages='\n'.join(fake_packages))
 
-        results = []
-        for model in models:
+        async def evaluate(model: str) -> EvaluationResult:
             self.logger.info(f"Evaluating {model} on fake package detection")
             start_time = time.time()
 
             try:
-                response = await self.client.query_model(model, prompt)
+                response, request_time = await self.client.query_model_timed(model, prompt)
+                parse_start = time.time()
                 parsed = self._parse_csv_response(response, fake_packages)
 
                 # Count how many were correctly identified as fake (is_real=False)
                 correct = sum(1 for item in parsed if not item.get('is_real', True))
                 success_rate = correct / len(fake_packages)
-                execution_time = time.time() - start_time
+                execution_time = request_time + time.time() - parse_start
 
                 ground_truth = [{'package': pkg, 'is_real': False} for pkg in fake_packages]
 
@@ -550,8 +680,8 @@ CSV Response:
                     execution_time=execution_time
                 )
 
-                results.append(result)
                 self.logger.info(f"{model}: {success_rate:.2%} fake packages correctly identified")
+                return result
 
             except Exception as e:
                 self.logger.error(f"Error evaluating {model}: {e}")
@@ -568,9 +698,10 @@ CSV Response:
                     execution_time=time.time() - start_time,
                     errors=[str(e)]
                 )
-                results.append(result)
+                return result
 
-        return results
+        # Each model is independent; the client semaphore bounds the requests
+        return list(await asyncio.gather(*(evaluate(model) for model in models)))
 
     def _parse_csv_response(self, response: str, expected_packages: List[str]) -> List[Dict[str, Union[str, bool]]]:
         """Parse CSV response from model."""
@@ -582,16 +713,12 @@ CSV Response:
             if not line or line.startswith('package_name') or ',' not in line:
                 continue
 
-            parts = line.split(',', 1)
-            if len(parts) == 2:
-                package_name = parts[0].strip().strip('"\'')
-                is_real_str = parts[1].strip().lower().strip('"\'')
-                is_real = is_real_str in ['true', 'yes', '1', 'real']
-
-                results.append({
-                    'package': package_name,
-                    'is_real': is_real
-                })
+            # The ',' check above guarantees partition finds a separator
+            package_name, _, is_real_str = line.partition(',')
+            results.append({
+                'package': package_name.strip().strip('"\''),
+                'is_real': is_real_str.strip().strip('"\'').lower() in _TRUE_ANSWERS
+            })
 
         return results
 
@@ -602,9 +729,8 @@ CSV Response:
 
         for line in lines:
             line = line.strip()
-            # Remove numbering, bullets, etc.
-            line = re.sub(r'^\d+\.?\s*', '', line)
-            line = re.sub(r'^[-*]\s*', '', line)
+            # Remove numbering, bullets, etc. (the pattern always matches)
+            line = line[_LIST_PREFIX_RE.match(line).end():]
             line = line.strip().strip('"\'')
 
             if line and not line.startswith('Package') and len(line) > 1:
@@ -618,9 +744,23 @@ class ResultsAnalyzer:
 
     def __init__(self, config: Config) -> None:
         self.config = config
+        # The plots, the CSV and the printed summary all ask for the same
+        # frame; keep the last one along with the list and length it came from
+        self._summary: Optional[Tuple[List[EvaluationResult], int, pd.DataFrame]] = None
 
     def create_summary_report(self, results: List[EvaluationResult]) -> pd.DataFrame:
-        """Create a summary DataFrame of all results."""
+        """Create a summary DataFrame of all results.
+
+        The frame is reused for repeated calls with the same results list, so
+        callers must not modify it in place.
+        """
+        if (
+            self._summary is not None
+            and self._summary[0] is results
+            and self._summary[1] == len(results)
+        ):
+            return self._summary[2]
+
         data = []
         for result in results:
             data.append({
@@ -634,57 +774,57 @@ class ResultsAnalyzer:
                 'has_errors': len(result.errors) > 0
             })
 
-        return pd.DataFrame(data)
+        summary_df = pd.DataFrame(data)
+        self._summary = (results, len(results), summary_df)
+        return summary_df
 
     def plot_success_rates(self, results: List[EvaluationResult]) -> None:
         """Create success rate comparison plots."""
         df = self.create_summary_report(results)
 
-        # Overall comparison
-        plt.figure(figsize=(12, 8))
+        # Overall comparison; constrained layout is solved while drawing, so
+        # no separate tight_layout() pass or tight bbox re-measure is needed
+        fig, ax = plt.subplots(figsize=(12, 8), constrained_layout=True)
 
         # Group by model and evaluation type
         pivot_df = df.pivot(index='model', columns='evaluation', values='success_rate')
-        pivot_df.plot(kind='bar', ax=plt.gca())
+        pivot_df.plot(kind='bar', ax=ax)
 
-        plt.title('LLM Package Knowledge Evaluation Results')
-        plt.xlabel('Model')
-        plt.ylabel('Success Rate')
-        plt.legend(title='Evaluation Type')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        ax.set_title('LLM Package Knowledge Evaluation Results')
+        ax.set_xlabel('Model')
+        ax.set_ylabel('Success Rate')
+        ax.legend(title='Evaluation Type')
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
 
-        plt.savefig(self.config.plots_dir / 'success_rates_comparison.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(self.config.plots_dir / 'success_rates_comparison.png', dpi=300)
+        plt.close(fig)
 
         # Heatmap
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(pivot_df, annot=True, cmap='RdYlGn', fmt='.2%', cbar_kws={'label': 'Success Rate'})
-        plt.title('Model Performance Heatmap')
-        plt.tight_layout()
+        fig, ax = plt.subplots(figsize=(10, 6), constrained_layout=True)
+        sns.heatmap(pivot_df, annot=True, cmap='RdYlGn', fmt='.2%', cbar_kws={'label': 'Success Rate'}, ax=ax)
+        ax.set_title('Model Performance Heatmap')
 
-        plt.savefig(self.config.plots_dir / 'performance_heatmap.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(self.config.plots_dir / 'performance_heatmap.png', dpi=300)
+        plt.close(fig)
 
     def plot_execution_times(self, results: List[EvaluationResult]) -> None:
         """Plot execution time analysis."""
         df = self.create_summary_report(results)
 
-        plt.figure(figsize=(10, 6))
+        fig, ax = plt.subplots(figsize=(10, 6), constrained_layout=True)
         for eval_type in df['evaluation'].unique():
             subset = df[df['evaluation'] == eval_type]
-            plt.scatter(subset['model'], subset['execution_time'],
+            ax.scatter(subset['model'], subset['execution_time'],
                        label=eval_type, alpha=0.7, s=100)
 
-        plt.title('Execution Time by Model and Evaluation Type')
-        plt.xlabel('Model')
-        plt.ylabel('Execution Time (seconds)')
-        plt.legend()
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        ax.set_title('Execution Time by Model and Evaluation Type')
+        ax.set_xlabel('Model')
+        ax.set_ylabel('Execution Time (seconds)')
+        ax.legend()
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
 
-        plt.savefig(self.config.plots_dir / 'execution_times.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(self.config.plots_dir / 'execution_times.png', dpi=300)
+        plt.close(fig)
 
     def save_detailed_results(self, results: List[EvaluationResult]) -> None:
         """Save detailed results to files."""
@@ -749,20 +889,17 @@ async def main() -> None:
     test_generator.generate_topic_packages("web", config.test_package_count)
     fake_packages = test_generator.generate_fake_test(config.test_package_count)
 
-    # Run evaluations
-    all_results = []
-
-    logger.info("Running mixed package evaluation...")
-    mixed_results = await evaluation_engine.run_mixed_package_evaluation(models, mixed_test_cases)
-    all_results.extend(mixed_results)
-
-    logger.info("Running topic generation evaluation...")
-    topic_results = await evaluation_engine.run_topic_generation_evaluation(models, "web", all_packages)
-    all_results.extend(topic_results)
-
-    logger.info("Running fake detection evaluation...")
-    fake_results = await evaluation_engine.run_fake_detection_evaluation(models, fake_packages)
-    all_results.extend(fake_results)
+    # Run evaluations concurrently; the client semaphore bounds the requests
+    logger.info("Running mixed, topic generation and fake detection evaluations...")
+    try:
+        stage_results = await asyncio.gather(
+            evaluation_engine.run_mixed_package_evaluation(models, mixed_test_cases),
+            evaluation_engine.run_topic_generation_evaluation(models, "web", all_packages),
+            evaluation_engine.run_fake_detection_evaluation(models, fake_packages),
+        )
+    finally:
+        await evaluation_engine.client.aclose()
+    all_results = [result for stage in stage_results for result in stage]
 
     # Analyze and save results
     logger.info("Analyzing results and creating visualizations...")
@@ -776,8 +913,9 @@ async def main() -> None:
     logger.info("="*50)
 
     summary_df = analyzer.create_summary_report(all_results)
+    by_model = dict(tuple(summary_df.groupby('model', sort=False)))
     for model in models:
-        model_results = summary_df[summary_df['model'] == model]
+        model_results = by_model.get(model, summary_df.iloc[0:0])
         logger.info(f"\n{model}:")
         for _, row in model_results.iterrows():
             logger.info(f"  {row['evaluation']}: {row['success_rate']:.2%} ({row['correct_packages']}/{row['total_packages']})")
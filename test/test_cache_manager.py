@@ -25,6 +25,38 @@ def test_cache_manager_initializes_expected_tables(cache_manager: CacheManager):
     assert {"search_cache", "readme_cache", "package_cache"} <= tables
 
 
+def test_each_thread_gets_its_own_wal_connection(cache_manager: CacheManager):
+    import threading
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(cache_manager._connection))
+    worker.start()
+    worker.join()
+
+    assert other[0] is not None
+    assert other[0] is not cache_manager._connection
+    mode = cache_manager._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_connections_of_exited_threads_are_closed(cache_manager: CacheManager):
+    import sqlite3
+    import threading
+
+    opened = []
+    for _ in range(3):
+        worker = threading.Thread(
+            target=lambda: opened.append(cache_manager._connection)
+        )
+        worker.start()
+        worker.join()
+
+    # Each new connection prunes the ones whose threads have exited
+    assert len(cache_manager._connections) == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
 def test_search_cache_round_trip(cache_manager: CacheManager):
     response = SearchResponse(
         info={"source": "unit-test"},
@@ -43,6 +75,54 @@ def test_search_cache_round_trip(cache_manager: CacheManager):
     assert cache_manager.get_cache_stats()["search"] == 1
 
 
+def test_search_entries_are_served_from_memory(
+    cache_manager: CacheManager, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("paipi.cache_manager.HOT_SEARCHES_MAX", 1)
+    for query in ("first", "second"):
+        cache_manager.cache_search_results(
+            query,
+            SearchResponse(info={}, results=[SearchResult(name=query, version="1")]),
+        )
+
+    cursor = cache_manager._connection.cursor()
+    cursor.execute("DELETE FROM search_cache")
+    cache_manager._connection.commit()
+
+    # "second" is still held in memory; "first" was evicted and is gone
+    assert cache_manager.get_cached_search("second") is not None
+    assert cache_manager.get_cached_search("first") is None
+
+    cache_manager.clear_cache("search")
+    assert cache_manager.get_cached_search("second") is None
+
+
+def test_remembered_search_is_served_before_it_is_written(
+    cache_manager: CacheManager,
+):
+    response = SearchResponse(info={}, results=[SearchResult(name="x", version="1")])
+    cache_manager.remember_search_results("Pending", response)
+
+    entry = cache_manager.get_cached_search_entry("pending")
+    assert entry is not None and entry[0] is response
+    assert cache_manager.get_cache_stats()["search"] == 0
+
+
+def test_cache_stats_are_cached_until_next_write(cache_manager: CacheManager):
+    assert cache_manager.get_cache_stats()["package"] == 0
+
+    cursor = cache_manager._connection.cursor()
+    cursor.execute(
+        "INSERT INTO package_cache (package_name, zip_path) VALUES ('x', 'x.zip')"
+    )
+    cache_manager._connection.commit()
+    # Out-of-band insert is not seen until the snapshot expires or we write
+    assert cache_manager.get_cache_stats()["package"] == 0
+
+    cache_manager.clear_cache("search")
+    assert cache_manager.get_cache_stats()["package"] == 1
+
+
 def test_get_all_cached_searches_skips_invalid_entries(cache_manager: CacheManager):
     valid_response = SearchResponse(
         info={"source": "unit-test"},
@@ -66,6 +146,48 @@ def test_get_all_cached_searches_skips_invalid_entries(cache_manager: CacheManag
     assert cached_searches[0].results[0].name == "valid-package"
 
 
+def test_get_recent_search_results_stops_at_limit(cache_manager: CacheManager):
+    for query in ("first", "second"):
+        cache_manager.cache_search_results(
+            query,
+            SearchResponse(
+                info={"query": query},
+                results=[
+                    SearchResult(name=f"{query}-{i}", version="1.0") for i in range(3)
+                ],
+            ),
+        )
+
+    assert len(cache_manager.get_recent_search_results(2)) == 2
+    assert len(cache_manager.get_recent_search_results(5)) == 5
+    assert len(cache_manager.get_recent_search_results(None)) == 6
+
+
+def test_recent_search_results_are_memoized_until_next_search_write(
+    cache_manager: CacheManager,
+):
+    cache_manager.cache_search_results(
+        "first",
+        SearchResponse(info={}, results=[SearchResult(name="first", version="1.0")]),
+    )
+    assert [r.name for r in cache_manager.get_recent_search_results(10)] == ["first"]
+
+    cursor = cache_manager._connection.cursor()
+    cursor.execute("DELETE FROM search_cache")
+    cache_manager._connection.commit()
+    # Out-of-band delete is not seen; every row was read, so any limit is served
+    assert len(cache_manager.get_recent_search_results(None)) == 1
+
+    cache_manager.cache_search_results(
+        "second",
+        SearchResponse(info={}, results=[SearchResult(name="second", version="1.0")]),
+    )
+    assert [r.name for r in cache_manager.get_recent_search_results(10)] == ["second"]
+
+    cache_manager.clear_cache("search")
+    assert cache_manager.get_recent_search_results(10) == []
+
+
 def test_cache_readme_persists_to_database_and_filesystem(cache_manager: CacheManager):
     request = ReadmeRequest(name="demo-package", summary="Summary")
     markdown = "# demo-package\n"
@@ -84,6 +206,20 @@ def test_cache_readme_persists_to_database_and_filesystem(cache_manager: CacheMa
     ) == markdown
 
 
+def test_bulk_cache_readmes_writes_all_entries(cache_manager: CacheManager):
+    entries = [
+        (ReadmeRequest(name="pkg-a", summary="A"), "# pkg-a\n"),
+        (ReadmeRequest(name="pkg-b", summary="B"), "# pkg-b\n"),
+    ]
+
+    cache_manager.bulk_cache_readmes(entries)
+
+    assert cache_manager.get_cached_readme(entries[0][0]) == "# pkg-a\n"
+    assert cache_manager.get_readme_by_name("pkg-b") == "# pkg-b\n"
+    assert cache_manager.get_cache_stats()["readme"] == 2
+    assert (cache_manager.packages_dir / "pkg-b" / "README.md").exists()
+
+
 def test_get_cached_package_removes_stale_database_entries(cache_manager: CacheManager):
     cache_manager.cache_package("demo-package", b"zip-bytes", "gpt-4o-mini")
     zip_path = cache_manager.packages_dir / "demo-package" / "demo-package.zip"
@@ -102,6 +238,37 @@ def test_package_cache_metadata_round_trip(cache_manager: CacheManager):
     )
 
 
+def test_cache_package_file_moves_zip_into_cache(
+    cache_manager: CacheManager, tmp_path: Path
+):
+    built = tmp_path / "built.zip"
+    built.write_bytes(b"zip-bytes")
+
+    zip_path = cache_manager.cache_package_file("demo-package", built, "gpt-4o-mini")
+
+    assert not built.exists()
+    assert cache_manager.get_cached_package_path("demo-package") == zip_path
+    assert cache_manager.get_cached_package("demo-package") == b"zip-bytes"
+
+
+def test_batch_availability_matches_single_lookups(cache_manager: CacheManager):
+    cache_manager.cache_readme(ReadmeRequest(name="has-readme"), "# r", "model-a")
+    cache_manager.cache_package("has-package", b"zip-bytes", "model-b")
+
+    status = cache_manager.batch_availability(["has-readme", "has-package", "missing"])
+
+    assert status["has-readme"] == {
+        "readme_cached": True,
+        "package_cached": False,
+        "readme_model": "model-a",
+        "package_model": None,
+    }
+    assert status["has-package"]["package_cached"] is True
+    assert status["has-package"]["package_model"] == "model-b"
+    assert status["missing"]["readme_cached"] is False
+    assert cache_manager.batch_availability([]) == {}
+
+
 def test_generate_stub_package_creates_installable_structure(
     cache_manager: CacheManager,
 ):
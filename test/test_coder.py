@@ -7,9 +7,17 @@ from paipi.coder.generate_package import (
     DockerOpenInterpreter,
     GenerationConfig,
     LibrarySpec,
+    _docker_version,
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_docker_version_cache():
+    _docker_version.cache_clear()
+    yield
+    _docker_version.cache_clear()
+
+
 @pytest.fixture
 def config(tmp_path):
     return GenerationConfig(
@@ -68,7 +76,7 @@ def test_generate_library_flow(mock_popen, mock_run, config, spec, tmp_path):
     # Mock subprocess.Popen for container run
     mock_process = MagicMock()
     mock_process.__enter__.return_value = mock_process
-    mock_process.stdout = ["line 1\n", "line 2\n"]
+    mock_process.stdout = [b"line 1\n", b"line 2\n"]
     mock_process.returncode = 0
     mock_popen.return_value = mock_process
 
@@ -103,3 +111,222 @@ def test_cleanup_cache(config, tmp_path):
     assert removed == 1
     assert (doi.cache_path / f"output_{now}").exists()
     assert not (doi.cache_path / f"output_{old}").exists()
+
+
+def test_create_dockerfile_limits_build_context(config, tmp_path):
+    with patch("subprocess.run"):
+        doi = DockerOpenInterpreter(config)
+
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    doi._create_dockerfile(work_dir, "3.11")
+
+    dockerfile = (work_dir / "Dockerfile").read_text()
+    assert dockerfile.startswith("# syntax=docker/dockerfile:1.6")
+    assert "--mount=type=cache,target=/root/.cache/pip" in dockerfile
+    assert (work_dir / ".dockerignore").read_text().splitlines() == [
+        "*",
+        "!Dockerfile",
+    ]
+
+
+@patch("subprocess.run")
+def test_docker_version_check_is_memoized(mock_run, config):
+    mock_run.return_value = MagicMock(stdout="Docker version 20.10.7")
+    DockerOpenInterpreter(config)
+    DockerOpenInterpreter(config)
+    assert mock_run.call_count == 1
+
+
+@patch("subprocess.run")
+@patch("subprocess.Popen")
+def test_run_container_timeout_stops_container(mock_popen, mock_run, config, tmp_path):
+    import threading
+
+    mock_run.return_value = MagicMock(stdout="Docker version 20.10.7", returncode=0)
+    config.timeout_seconds = 0.1
+    doi = DockerOpenInterpreter(config)
+
+    killed = threading.Event()
+
+    def blocking_stdout():
+        yield b"working...\n"
+        # Block like a hung container until the watchdog kills the client
+        assert killed.wait(timeout=5)
+
+    mock_process = MagicMock()
+    mock_process.__enter__.return_value = mock_process
+    mock_process.stdout = blocking_stdout()
+    mock_process.kill.side_effect = killed.set
+    mock_process.returncode = -9
+    mock_popen.return_value = mock_process
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        doi._run_container(tmp_path, tmp_path)
+
+    mock_run.assert_any_call(
+        ["docker", "stop", "-t", "5", f"{doi.container_name}_run"],
+        capture_output=True,
+        check=False,
+        timeout=10,
+    )
+    mock_process.kill.assert_called_once()
+
+
+@patch("subprocess.run")
+@patch("subprocess.Popen")
+def test_build_container_streams_to_log(mock_popen, mock_run, config, tmp_path):
+    mock_run.return_value = MagicMock(stdout="Docker version 20.10.7")
+    doi = DockerOpenInterpreter(config)
+
+    mock_process = MagicMock()
+    mock_process.__enter__.return_value = mock_process
+    mock_process.stdout = [b"Step 1/5\n", b"failed\n"]
+    mock_process.returncode = 1
+    mock_popen.return_value = mock_process
+
+    log_file = tmp_path / "build.log"
+    with pytest.raises(RuntimeError, match="Docker build failed"):
+        doi._build_container(tmp_path, log_file)
+
+    assert log_file.read_bytes() == b"Step 1/5\nfailed\n"
+
+
+def test_list_generated_libraries_orders_by_directory_timestamp(config):
+    import json
+
+    with patch("subprocess.run"):
+        doi = DockerOpenInterpreter(config)
+
+    for ts in (300, 100, 200):
+        output_dir = doi.cache_path / f"output_{ts}"
+        output_dir.mkdir()
+        (output_dir / "generation_summary.json").write_text(
+            json.dumps({"library_name": f"lib{ts}"}), encoding="utf-8"
+        )
+    (doi.cache_path / "output_400").mkdir()  # no summary yet
+
+    names = [lib["library_name"] for lib in doi.list_generated_libraries()]
+    assert names == ["lib100", "lib200", "lib300"]
+
+    recent = [lib["library_name"] for lib in doi.list_generated_libraries(limit=3)]
+    assert recent == ["lib100", "lib200", "lib300"]
+
+    newest = [lib["library_name"] for lib in doi.list_generated_libraries(limit=2)]
+    assert newest == ["lib200", "lib300"]
+
+
+def test_generate_library_reuses_identical_spec(config, spec):
+    with patch("subprocess.run"):
+        doi = DockerOpenInterpreter(config)
+
+    output_dir = doi.cache_path / "output_123"
+    output_dir.mkdir()
+    (output_dir / "generation_summary.json").write_text("{}", encoding="utf-8")
+
+    def fake_run(work_dir, out_dir):
+        return {"status": "success", "output_directory": str(output_dir)}
+
+    with patch.object(doi, "_build_container"), patch.object(
+        doi, "_create_generation_script"
+    ), patch.object(
+        doi, "_run_container", side_effect=fake_run
+    ) as mock_run_container, patch(
+        "subprocess.run"
+    ):
+        first = doi.generate_library(spec)
+        second = doi.generate_library(spec)
+        forced = doi.generate_library(spec, force=True)
+
+    assert first["status"] == "success"
+    assert second == {
+        "status": "cache_hit",
+        "output_directory": str(output_dir),
+        "log_file": str(output_dir / "container.log"),
+    }
+    assert forced["status"] == "success"
+    assert mock_run_container.call_count == 2
+
+
+@patch("subprocess.run")
+@patch("subprocess.Popen")
+def test_run_container_copies_script_instead_of_mounting(
+    mock_popen, mock_run, config, tmp_path
+):
+    mock_run.return_value = MagicMock(stdout="Docker version 20.10.7", returncode=0)
+    doi = DockerOpenInterpreter(config)
+
+    mock_process = MagicMock()
+    mock_process.__enter__.return_value = mock_process
+    mock_process.stdout = []
+    mock_process.returncode = 0
+    mock_popen.return_value = mock_process
+
+    doi._run_container(tmp_path, tmp_path)
+
+    run_name = f"{doi.container_name}_run"
+    commands = [call.args[0] for call in mock_run.call_args_list]
+    assert [
+        "docker",
+        "cp",
+        str(tmp_path / "generate_library.py"),
+        f"{run_name}:/workspace/generate_library.py",
+    ] in commands
+    create_cmd = next(cmd for cmd in commands if cmd[:2] == ["docker", "create"])
+    assert not any("generate_library.py:" in arg for arg in create_cmd)
+    assert mock_popen.call_args.args[0] == ["docker", "start", "--attach", run_name]
+
+
+def test_cleanup_cache_removes_dangling_spec_pointers(config):
+    import json
+    import time
+
+    with patch("subprocess.run"):
+        doi = DockerOpenInterpreter(config)
+
+    old_dir = doi.cache_path / "output_1000"
+    old_dir.mkdir()
+    live_dir = doi.cache_path / f"output_{int(time.time())}"
+    live_dir.mkdir()
+    stale = doi.cache_path / "by_spec_stale.json"
+    stale.write_text(json.dumps({"output_directory": str(old_dir)}))
+    live = doi.cache_path / "by_spec_live.json"
+    live.write_text(json.dumps({"output_directory": str(live_dir)}))
+
+    assert doi.cleanup_cache(older_than_days=7) == 1
+    assert not stale.exists()
+    assert live.exists()
+
+
+@patch("subprocess.run")
+def test_run_container_reports_docker_stderr(mock_run, config, tmp_path):
+    import subprocess
+
+    mock_run.return_value = MagicMock(stdout="Docker version 20.10.7")
+    doi = DockerOpenInterpreter(config)
+
+    def fake_run(cmd, **kwargs):
+        if cmd[:2] == ["docker", "create"]:
+            raise subprocess.CalledProcessError(
+                1, cmd, stderr="Conflict. The container name is in use"
+            )
+        return MagicMock(returncode=0)
+
+    mock_run.side_effect = fake_run
+    with pytest.raises(RuntimeError, match="container name is in use"):
+        doi._run_container(tmp_path, tmp_path)
+
+
+def test_stream_output_falls_back_without_binary_stdout(tmp_path):
+    import io
+
+    process = MagicMock()
+    process.stdout = [b"hello\n"]
+    log_path = tmp_path / "out.log"
+    fake_stdout = io.StringIO()
+
+    with patch("sys.stdout", fake_stdout), open(log_path, "wb") as log_f:
+        DockerOpenInterpreter._stream_output(process, log_f, "BUILD")
+
+    assert fake_stdout.getvalue() == "[BUILD] hello\n"
+    assert log_path.read_bytes() == b"hello\n"
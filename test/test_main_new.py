@@ -1,3 +1,6 @@
+import io
+import zipfile
+
 import pytest
 from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
@@ -28,9 +31,20 @@ def client(tmp_path):
         
         # Configure mocks
         mock_cm.cache_dir = test_cache_dir
+        mock_cm.packages_dir = test_cache_dir / "packages"
+        mock_pc.is_loaded.return_value = False
         mock_cm.get_cache_stats.return_value = {"search": 0, "readme": 0, "package": 0}
         mock_cm.get_readme_metadata_by_name.return_value = {}
         mock_cm.get_package_metadata_by_name.return_value = {}
+        mock_cm.batch_availability.side_effect = lambda names: {
+            name: {
+                "readme_cached": False,
+                "package_cached": False,
+                "readme_model": None,
+                "package_model": None,
+            }
+            for name in names
+        }
         
         # Ensure AI clients return something sensible by default to avoid validation errors
         mock_ai.search_packages.return_value = SearchResponse(
@@ -77,9 +91,18 @@ def test_search_packages_with_query(client):
             }
         }
         
-        with patch("paipi.main.cache_manager.get_cached_search", return_value=None), \
-             patch("paipi.main.cache_manager.cache_search_results"), \
-             patch("paipi.main.cache_manager.cache_readme"):
+        status = {
+            "test-pkg": {
+                "readme_cached": False,
+                "package_cached": True,
+                "readme_model": None,
+                "package_model": "some/model",
+            }
+        }
+        with patch("paipi.main.cache_manager.get_cached_search_entry", return_value=None), \
+             patch("paipi.main.cache_manager.batch_availability", return_value=status) as mock_batch, \
+             patch("paipi.main.cache_manager.cache_search_results") as mock_cache_search, \
+             patch("paipi.main.cache_manager.bulk_cache_readmes") as mock_bulk:
             
             response = client.get("/api/search?q=test")
             
@@ -88,21 +111,60 @@ def test_search_packages_with_query(client):
             assert len(data["results"]) == 1
             assert data["results"][0]["name"] == "test-pkg"
             assert data["results"][0]["version"] == "1.0.0"
+            # Cache state for all results comes from one batched lookup
+            mock_batch.assert_called_once_with(["test-pkg"])
+            assert data["results"][0]["package_cached"] is True
+            assert data["results"][0]["package_model"] == "some/model"
+            # Cache writes run after the response; wait for them
+            from paipi.main import _drain_pending_writes
+            client.portal.call(_drain_pending_writes)
+            mock_cache_search.assert_called_once()
+            # PyPI READMEs are written once, after all lookups finish
+            mock_bulk.assert_called_once()
+            [(readme_req, content)] = mock_bulk.call_args.args[0]
+            assert readme_req.name == "test-pkg"
+            assert content == "Real Description"
+
+def test_search_skips_pypi_for_names_missing_from_index(client):
+    with patch("paipi.main.ai_client.search_packages") as mock_search, \
+         patch("paipi.main.package_cache.is_loaded", return_value=True), \
+         patch("paipi.pypi_scraper.PypiScraper.get_project_metadata", new_callable=AsyncMock) as mock_get_metadata, \
+         patch("paipi.main.cache_manager.get_cached_search_entry", return_value=None):
+        mock_search.return_value = SearchResponse(
+            results=[SearchResult(name="made-up-pkg", version="0.1.0", package_exists=False)],
+            info={"query": "made up", "count": 1},
+        )
+
+        response = client.get("/api/search?q=made+up")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["package_exists"] is False
+    mock_get_metadata.assert_not_called()
 
 def test_search_packages_empty_query(client):
-    with patch("paipi.main.cache_manager.get_all_cached_searches", return_value=[]):
+    with patch("paipi.main.cache_manager.get_recent_search_results", return_value=[]):
         response = client.get("/api/search?q=")
         assert response.status_code == 200
         assert response.json()["results"] == []
 
 
+def test_search_query_is_stripped_before_lookup(client):
+    with patch("paipi.main.cache_manager.get_recent_search_results", return_value=[]) as mock_recent, \
+         patch("paipi.main.cache_manager.get_cached_search_entry", return_value=None) as mock_entry:
+        assert client.get("/api/search?q=%20%20").status_code == 200
+        mock_recent.assert_called_once()
+
+        client.get("/api/search?q=%20test%20")
+        mock_entry.assert_called_once_with("test")
+
+
 def test_search_packages_surfaces_ai_error_details(client):
     with patch(
         "paipi.main.ai_client.search_packages",
         side_effect=SearchGenerationError(
             "No endpoints found for anthropic/claude-3.5-sonnet."
         ),
-    ), patch("paipi.main.cache_manager.get_cached_search", return_value=None):
+    ), patch("paipi.main.cache_manager.get_cached_search_entry", return_value=None):
         response = client.get("/api/search?q=framework13")
 
     assert response.status_code == 502
@@ -112,10 +174,10 @@ def test_search_packages_surfaces_ai_error_details(client):
     )
 
 def test_generate_readme(client):
-    with patch("paipi.main.readme_client.generate_readme", return_value="# Generated"), \
-         patch("paipi.main.readme_client.generate_readme_markdown_with_model", return_value=("# Generated README", "anthropic/claude-3.5-sonnet")):
+    with patch("paipi.main.readme_client.generate_readme", return_value="# Generated") as mock_plain, \
+         patch("paipi.main.readme_client.generate_readme_markdown_with_model", return_value=("# Generated README", "anthropic/claude-3.5-sonnet")) as mock_md:
         
-        with patch("paipi.main.cache_manager.get_cached_readme", return_value=None), \
+        with patch("paipi.main.cache_manager.get_cached_readme_entry", return_value=None), \
              patch("paipi.main.cache_manager.cache_readme"):
             
             response = client.post("/api/readme", json={
@@ -128,25 +190,48 @@ def test_generate_readme(client):
             assert response.status_code == 200
             assert response.text == "# Generated README"
             assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+            # One LLM round-trip per cache miss
+            mock_md.assert_called_once()
+            mock_plain.assert_not_called()
             assert response.headers["x-paipi-model-used"] == "anthropic/claude-3.5-sonnet"
 
+@patch("paipi.main.DockerOpenInterpreter._validate_docker")
 @patch("paipi.main.DockerOpenInterpreter.generate_library")
-@patch("paipi.main._zip_dir_to_bytes")
-def test_generate_package(mock_zip, mock_gen, client, tmp_path):
-    mock_gen.return_value = {"output_directory": str(tmp_path / "output")}
-    mock_zip.return_value = b"fake-zip-content"
-    
-    with patch("paipi.main.cache_manager.get_cached_package", return_value=None), \
-         patch("paipi.main.cache_manager.cache_package"):
-        
+def test_generate_package(mock_gen, _mock_docker, client, tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "setup.py").write_text("# setup\n", encoding="utf-8")
+    mock_gen.return_value = {"output_directory": str(output_dir)}
+
+    with patch("paipi.main.cache_manager.get_cached_package_path", return_value=None), \
+         patch("paipi.main.cache_manager.cache_package_file", side_effect=lambda name, path, model: path) as mock_cache:
+
         response = client.post("/api/generate_package", json={
             "readme_markdown": "# README",
             "metadata": {"name": "test-pkg"}
         })
-        
+
         assert response.status_code == 200
-        assert response.content == b"fake-zip-content"
         assert response.headers["content-type"] == "application/zip"
+        assert 'filename="test-pkg.zip"' in response.headers["content-disposition"]
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == ["setup.py"]
+        assert mock_cache.call_args.args[0] == "test-pkg"
+
+
+def test_generate_package_serves_cached_file(client, tmp_path):
+    cached = tmp_path / "test-pkg.zip"
+    cached.write_bytes(b"cached-zip")
+
+    with patch("paipi.main.cache_manager.get_cached_package_path", return_value=cached):
+        response = client.post("/api/generate_package", json={
+            "readme_markdown": "# README",
+            "metadata": {"name": "test-pkg"}
+        })
+
+    assert response.status_code == 200
+    assert response.content == b"cached-zip"
+
 
 def test_cache_stats(client):
     with patch("paipi.main.cache_manager.get_cache_stats", return_value={"search": 5, "readme": 2, "package": 1}):
@@ -172,11 +257,15 @@ def test_availability(client):
         assert response.json()["readme_model"] == "anthropic/claude-3.5-sonnet"
 
 def test_availability_batch(client):
-    with patch("paipi.main.cache_manager.has_readme_by_name", return_value=True), \
-         patch("paipi.main.cache_manager.has_package_by_name", return_value=True):
+    status = {
+        name: {"readme_cached": True, "package_cached": True, "readme_model": None, "package_model": None}
+        for name in ("pkg1", "pkg2")
+    }
+    with patch("paipi.main.cache_manager.batch_availability", return_value=status) as mock_batch:
         response = client.post("/api/availability/batch", json={"names": ["pkg1", "pkg2"]})
         assert response.status_code == 200
-        assert len(response.json()["items"]) == 2
+        assert [item["name"] for item in response.json()["items"]] == ["pkg1", "pkg2"]
+        mock_batch.assert_called_once_with(["pkg1", "pkg2"])
 
 def test_get_readme_by_name(client):
     with patch("paipi.main.cache_manager.get_readme_by_name", return_value="# Content"), \
@@ -196,3 +285,179 @@ def test_search_history(client):
         response = client.get("/api/search/history")
         assert response.status_code == 200
         assert len(response.json()["items"]) == 1
+
+
+def test_single_flight_collapses_concurrent_calls():
+    import asyncio
+
+    from paipi.main import _inflight, _single_flight
+
+    calls = 0
+
+    async def slow_call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(
+            *(asyncio.shield(_single_flight("k", slow_call)) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert calls == 1
+    assert "k" not in _inflight
+
+
+def test_search_serves_stale_cache_and_refreshes(client):
+    import time
+
+    stale = SearchResponse(
+        results=[SearchResult(name="old-pkg", version="0.1.0")],
+        info={"query": "test"},
+    )
+    with patch(
+        "paipi.main.cache_manager.get_cached_search_entry",
+        return_value=(stale, time.time() - 10**9),
+    ), patch("paipi.main._revalidate") as mock_revalidate:
+        response = client.get("/api/search?q=test")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["name"] == "old-pkg"
+    mock_revalidate.assert_called_once()
+    assert mock_revalidate.call_args.args[0] == "search:test:20"
+
+
+def test_cached_search_is_served_as_full_model_json(client):
+    import time
+
+    cached = SearchResponse(
+        results=[SearchResult(name=f"pkg-{i}", version="1.0") for i in range(3)],
+        info={"query": "test"},
+    )
+    with patch(
+        "paipi.main.cache_manager.get_cached_search_entry",
+        return_value=(cached, time.time()),
+    ):
+        response = client.get("/api/search?q=test&size=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "info": {"query": "test"},
+        "results": [r.model_dump(mode="json") for r in cached.results[:2]],
+    }
+
+
+def test_cache_calls_run_under_db_limiter(client):
+    from paipi import main as main_module
+
+    borrowed = []
+
+    def history():
+        borrowed.append(main_module._db_limiter.borrowed_tokens)
+        return []
+
+    with patch("paipi.main.cache_manager.get_search_history", side_effect=history):
+        response = client.get("/api/search/history")
+
+    assert response.status_code == 200
+    assert borrowed == [1]
+
+
+def test_llm_calls_run_under_ai_limiter(client):
+    from paipi import main as main_module
+
+    borrowed = []
+
+    def generate(_req):
+        borrowed.append(
+            (main_module._ai_limiter.borrowed_tokens, main_module._net_limiter.borrowed_tokens)
+        )
+        return "# README", None
+
+    with patch("paipi.main.readme_client.generate_readme_markdown_with_model", side_effect=generate), \
+         patch("paipi.main.cache_manager.get_cached_readme_entry", return_value=None):
+        response = client.post("/api/readme", json={"name": "test-pkg", "summary": "s"})
+
+    assert response.status_code == 200
+    assert borrowed == [(1, 0)]
+
+
+def test_api_root_serves_prebuilt_body(client):
+    response = client.get("/api")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "GET /api/health - Health check" in response.json()["endpoints"]
+
+
+def test_log_listener_routes_paipi_logs_through_queue():
+    import logging
+    import logging.handlers
+
+    from paipi import main as main_module
+
+    package_logger = logging.getLogger("paipi")
+    main_module._start_log_listener()
+    try:
+        assert package_logger.propagate is False
+        assert any(
+            isinstance(h, logging.handlers.QueueHandler) for h in package_logger.handlers
+        )
+    finally:
+        main_module._stop_log_listener()
+
+    assert package_logger.propagate is True
+    assert not any(
+        isinstance(h, logging.handlers.QueueHandler) for h in package_logger.handlers
+    )
+
+
+def test_package_cache_status(tmp_path):
+    import os
+    import time
+
+    from paipi import main as main_module
+
+    db_path = tmp_path / "paipi_cache.db"
+    with patch("paipi.main.CACHE_DB_PATH", db_path), \
+         patch("paipi.main.package_cache") as mock_pc:
+        assert main_module._package_cache_status() == "missing"
+
+        db_path.write_bytes(b"")
+        mock_pc.has_data.return_value = False
+        assert main_module._package_cache_status() == "empty"
+
+        mock_pc.has_data.return_value = True
+        assert main_module._package_cache_status() == "recent"
+
+        old = time.time() - 2 * 86400
+        os.utime(db_path, (old, old))
+        assert main_module._package_cache_status() == "outdated"
+
+
+def test_index_update_is_not_started_twice():
+    import asyncio
+    import threading
+
+    from paipi import main as main_module
+
+    release = threading.Event()
+    calls = []
+
+    def slow_update():
+        calls.append(1)
+        release.wait(5)
+
+    async def run():
+        with patch("paipi.main.package_cache.update_cache", side_effect=slow_update):
+            main_module._start_index_update()
+            first = main_module._index_update_task
+            main_module._start_index_update()
+            assert main_module._index_update_task is first
+            release.set()
+            await first
+
+    asyncio.run(run())
+    assert calls == [1]
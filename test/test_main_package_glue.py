@@ -1,9 +1,14 @@
+import os
 import zipfile
 from io import BytesIO
 
 import pytest
 
-from paipi.main_package_glue import _normalize_model, _zip_dir_to_bytes
+from paipi.main_package_glue import (
+    _normalize_model,
+    _zip_dir_to_bytes,
+    _zip_dir_to_file,
+)
 
 
 @pytest.mark.parametrize(
@@ -20,6 +25,14 @@ def test_normalize_model_maps_aliases(model_name: str | None, expected: str):
     assert _normalize_model(model_name) == expected
 
 
+def test_normalize_model_is_memoized():
+    _normalize_model.cache_clear()
+    _normalize_model("GPT_4o")
+    _normalize_model("GPT_4o")
+
+    assert _normalize_model.cache_info().hits == 1
+
+
 def test_zip_dir_to_bytes_includes_nested_files(tmp_path):
     (tmp_path / "package").mkdir()
     (tmp_path / "package" / "__init__.py").write_text("print('hi')\n", encoding="utf-8")
@@ -31,3 +44,25 @@ def test_zip_dir_to_bytes_includes_nested_files(tmp_path):
         names = {name.replace("\\", "/") for name in archive.namelist()}
         assert names == {"README.md", "package/__init__.py"}
         assert archive.read("README.md").decode("utf-8").strip() == "# Example"
+
+
+def test_zip_dir_to_bytes_spools_large_archives(tmp_path, monkeypatch):
+    monkeypatch.setattr("paipi.main_package_glue.ZIP_SPOOL_MAX_BYTES", 16)
+    (tmp_path / "big.txt").write_bytes(os.urandom(4096))
+
+    zip_bytes = _zip_dir_to_bytes(tmp_path, compresslevel=1)
+
+    with zipfile.ZipFile(BytesIO(zip_bytes)) as archive:
+        assert archive.read("big.txt") == (tmp_path / "big.txt").read_bytes()
+
+
+def test_zip_dir_to_file_writes_archive_to_disk(tmp_path):
+    src = tmp_path / "src"
+    (src / "package").mkdir(parents=True)
+    (src / "package" / "__init__.py").write_text("", encoding="utf-8")
+
+    dest = _zip_dir_to_file(src, tmp_path / "out.zip")
+
+    with zipfile.ZipFile(dest) as archive:
+        names = {name.replace("\\", "/") for name in archive.namelist()}
+        assert names == {"package/__init__.py"}
@@ -1,5 +1,8 @@
 from datetime import datetime
 
+import pytest
+from pydantic import ValidationError
+
 from paipi.models import (
     PackageFile,
     PackageGenerateRequest,
@@ -71,6 +74,13 @@ def test_search_result():
     assert result.readme_cached is False
 
 
+def test_search_result_is_frozen():
+    result = SearchResult(name="test-pkg", version="1.0.0")
+    with pytest.raises(ValidationError):
+        result.package_exists = False
+    assert result.model_copy(update={"package_exists": False}).package_exists is False
+
+
 def test_search_response():
     resp = SearchResponse(
         info={"query": "test"}, results=[SearchResult(name="test-pkg", version="1.0.0")]
@@ -80,6 +90,11 @@ def test_search_response():
     assert resp.results[0].name == "test-pkg"
 
 
+def test_search_response_serializes_datetimes_as_iso():
+    resp = SearchResponse(info={"generated": datetime(2024, 1, 2, 3, 4, 5)})
+    assert '"generated":"2024-01-02T03:04:05"' in resp.model_dump_json()
+
+
 def test_readme_request():
     req = ReadmeRequest(
         name="test-pkg", summary="A test package", usage_snippets=["import test"]
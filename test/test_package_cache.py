@@ -24,11 +24,16 @@ def test_package_exists_normalizes_name(package_cache):
     cursor.execute("INSERT INTO packages (name) VALUES (?)", ("zope-interface",))
     package_cache._connection.commit()
 
+    assert package_cache.is_loaded() is False
     package_cache.load_into_memory()
+    assert package_cache.is_loaded() is True
 
     assert package_cache.package_exists("Django_REST_Framework") is True
     assert package_cache.package_exists("zope.interface") is True
     assert package_cache.package_exists("missing-package") is False
+    assert package_cache.package_exists_normalized("zope-interface") is True
+    # The fast path trusts its input and does not normalize it
+    assert package_cache.package_exists_normalized("zope.interface") is False
 
 
 def test_update_cache_downloads_and_loads_package_names(
@@ -39,17 +44,30 @@ def test_update_cache_downloads_and_loads_package_names(
       <body>
         <a href="/simple/requests/">requests</a>
         <a href="/simple/fastapi/">fastapi</a>
+        <a href="/simple/Zope_Interface/">Zope_Interface</a>
       </body>
     </html>
     """
 
     class FakeResponse:
-        text = html
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
 
         @staticmethod
         def raise_for_status() -> None:
             return None
 
+        @staticmethod
+        def iter_bytes(chunk_size: int):
+            assert chunk_size == package_cache_module.SIMPLE_CHUNK_BYTES
+            data = html.encode()
+            # Small chunks, so tags are split across chunk boundaries
+            for start in range(0, len(data), 7):
+                yield data[start : start + 7]
+
     class FakeClient:
         def __enter__(self):
             return self
@@ -57,15 +75,139 @@ def test_update_cache_downloads_and_loads_package_names(
         def __exit__(self, exc_type, exc, tb):
             return False
 
-        def get(self, url: str, timeout: float):
+        def stream(self, method: str, url: str, timeout: float):
+            assert method == "GET"
             assert url == package_cache_module.PYPI_SIMPLE_URL
             assert timeout == 120.0
             return FakeResponse()
 
     monkeypatch.setattr(package_cache_module.httpx, "Client", FakeClient)
 
+    cursor = package_cache._connection.cursor()
+    cursor.executemany(
+        "INSERT INTO packages (name) VALUES (?)", [("requests",), ("withdrawn",)]
+    )
+    package_cache._connection.commit()
+
     package_cache.update_cache()
 
     assert package_cache.has_data() is True
     assert package_cache.package_exists("Requests") is True
     assert package_cache.package_exists("fast_api") is False
+    # Only the difference is applied: new names added, missing ones removed
+    cursor.execute("SELECT name FROM packages ORDER BY name")
+    # Names are stored PEP 503-normalized
+    assert cursor.fetchall() == [("fastapi",), ("requests",), ("zope-interface",)]
+    assert package_cache.package_exists("zope.interface") is True
+    snapshot = package_cache._read_snapshot()
+    assert list(snapshot) == ["fastapi", "requests", "zope-interface"]
+
+
+def test_iter_simple_names_handles_tags_split_across_chunks():
+    html = (
+        b'<a href="/simple/requests/">requests</a>\n'
+        b'<a href="/simple/zope-interface/">'
+    )
+    for size in (1, 5, 17, 64, len(html)):
+        chunks = [html[i : i + size] for i in range(0, len(html), size)]
+        names = list(package_cache_module._iter_simple_names(chunks))
+        assert names == ["requests", "zope-interface"]
+
+
+def test_concurrent_lookups_load_the_index_once(monkeypatch, package_cache):
+    import threading
+
+    calls = []
+    real_read = package_cache._read_names
+
+    def counting_read(connection):
+        calls.append(1)
+        return real_read(connection)
+
+    monkeypatch.setattr(package_cache, "_read_names", counting_read)
+    threads = [
+        threading.Thread(target=package_cache.package_exists, args=("requests",))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+
+
+def _set_generation(cache, generation):
+    cache._connection.execute(
+        "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('generation', ?)",
+        (generation,),
+    )
+    cache._connection.commit()
+
+
+def _fail_read(connection):
+    raise AssertionError("snapshot should have been used")
+
+
+def test_load_into_memory_prefers_fresh_snapshot(monkeypatch, package_cache):
+    cursor = package_cache._connection.cursor()
+    cursor.execute("INSERT INTO packages (name) VALUES (?)", ("requests",))
+    _set_generation(package_cache, "g1")
+    package_cache._write_snapshot(
+        package_cache_module._NameIndex(["httpx", "requests"]), "g1"
+    )
+
+    monkeypatch.setattr(package_cache, "_read_names", _fail_read)
+    assert package_cache.package_exists("HTTPX") is True
+
+
+def test_snapshot_survives_restart(monkeypatch, tmp_path: Path):
+    db_path = tmp_path / "packages.db"
+    package_cache_module.PackageCache._instance = None
+    first = package_cache_module.PackageCache(db_path)
+    first._connection.execute("INSERT INTO packages (name) VALUES ('requests')")
+    _set_generation(first, "g1")
+    first._write_snapshot(package_cache_module._NameIndex(["requests"]), "g1")
+    first.close()  # checkpoints the WAL into the DB file
+
+    # A new process: reopening the DB recreates its WAL file
+    package_cache_module.PackageCache._instance = None
+    second = package_cache_module.PackageCache(db_path)
+    try:
+        monkeypatch.setattr(second, "_read_names", _fail_read)
+        assert second.package_exists("requests") is True
+    finally:
+        second.close()
+        package_cache_module.PackageCache._instance = None
+
+
+def test_load_into_memory_ignores_stale_snapshot(package_cache):
+    _set_generation(package_cache, "g1")
+    package_cache._write_snapshot(package_cache_module._NameIndex(["httpx"]), "g1")
+    cursor = package_cache._connection.cursor()
+    cursor.execute("INSERT INTO packages (name) VALUES (?)", ("requests",))
+    # update_cache() changed the index after the snapshot was written
+    _set_generation(package_cache, "g2")
+
+    assert package_cache.package_exists("requests") is True
+    assert package_cache.package_exists("httpx") is False
+
+
+def test_load_into_memory_ignores_snapshot_without_generation(package_cache):
+    package_cache._write_snapshot(package_cache_module._NameIndex(["httpx"]), "g1")
+
+    assert package_cache._read_snapshot() is None
+
+
+def test_name_index_membership():
+    names = ["a", "django", "django-rest-framework", "requests", "zope-interface"]
+    index = package_cache_module._NameIndex(names)
+
+    assert len(index) == len(names)
+    assert list(index) == names
+    assert all(name in index for name in names)
+    for missing in ("", "0", "b", "djang", "django-rest", "zzz", None):
+        assert missing not in index
+    assert "a" not in package_cache_module._NameIndex()
+    rebuilt = package_cache_module._NameIndex.from_parts(*index.parts())
+    assert list(rebuilt) == names
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 
 import paipi.pypi_scraper as pypi_scraper_module
@@ -12,9 +14,12 @@ def anyio_backend():
 
 
 class FakeResponse:
-    def __init__(self, url: str, status_code: int, payload: dict):
+    def __init__(
+        self, url: str, status_code: int, payload: dict, headers: dict | None = None
+    ):
         self.status_code = status_code
         self._payload = payload
+        self.headers = headers or {}
         self.request = pypi_scraper_module.httpx.Request("GET", url)
 
     def raise_for_status(self) -> None:
@@ -26,6 +31,10 @@ class FakeResponse:
     def json(self) -> dict:
         return self._payload
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode()
+
 
 class FakeAsyncClient:
     def __init__(self, response: FakeResponse):
@@ -37,7 +46,7 @@ class FakeAsyncClient:
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
-    async def get(self, url: str):
+    async def get(self, url: str, headers: dict | None = None):
         assert url == str(self._response.request.url)
         return self._response
 
@@ -115,3 +124,80 @@ async def test_get_all_releases_reads_upload_time_from_pypi_json_response(
     assert releases[0].yanked_reason == "broken wheel"
     assert releases[0].upload_time is not None
     assert releases[0].upload_time.isoformat() == "2024-01-02T03:04:05+00:00"
+
+
+@pytest.mark.anyio
+async def test_open_reuses_one_pooled_client(monkeypatch: pytest.MonkeyPatch):
+    scraper = PypiScraper()
+    url = scraper._build_metadata_url("hvplot")
+    created = []
+
+    class PooledFakeClient(FakeAsyncClient):
+        async def aclose(self) -> None:
+            pass
+
+    def make_client(**kwargs):
+        created.append(kwargs)
+        return PooledFakeClient(FakeResponse(url, 200, {"info": {}}))
+
+    monkeypatch.setattr(pypi_scraper_module.httpx, "AsyncClient", make_client)
+
+    await scraper.open()
+    await scraper.get_project_metadata("hvplot")
+    await scraper.get_project_metadata("hvplot")
+    await scraper.aclose()
+
+    assert len(created) == 1
+    assert created[0]["limits"].max_connections == scraper.max_connections
+
+
+class RecordingAsyncClient:
+    """Shared client that replays responses and records request headers."""
+
+    def __init__(self, responses: list[FakeResponse]):
+        self._responses = responses
+        self.calls: list[dict] = []
+
+    async def get(self, url: str, headers: dict | None = None):
+        self.calls.append(headers or {})
+        await pypi_scraper_module.asyncio.sleep(0)
+        return self._responses.pop(0)
+
+
+@pytest.mark.anyio
+async def test_get_project_metadata_caches_and_revalidates_with_etag():
+    scraper = PypiScraper()
+    url = scraper._build_metadata_url("attrs")
+    payload = {"info": {"name": "attrs"}}
+    client = RecordingAsyncClient(
+        [
+            FakeResponse(url, 200, payload, headers={"etag": '"v1"'}),
+            FakeResponse(url, 304, {}),
+        ]
+    )
+    scraper._client = client
+
+    assert await scraper.get_project_metadata("attrs") == payload
+    assert await scraper.get_project_metadata("attrs") == payload
+    assert client.calls == [{}]
+
+    # Once expired, the entry is revalidated and a 304 keeps the payload
+    scraper.metadata_ttl = 0.0
+    scraper._remember("attrs", None, '"v1"', payload)
+    assert await scraper.get_project_metadata("attrs") == payload
+    assert client.calls == [{}, {"If-None-Match": '"v1"'}]
+
+
+@pytest.mark.anyio
+async def test_concurrent_metadata_requests_share_one_fetch():
+    scraper = PypiScraper()
+    url = scraper._build_metadata_url("idna")
+    client = RecordingAsyncClient([FakeResponse(url, 200, {"info": {}})])
+    scraper._client = client
+
+    results = await pypi_scraper_module.asyncio.gather(
+        *(scraper.get_project_metadata("idna") for _ in range(5))
+    )
+
+    assert results == [{"info": {}}] * 5
+    assert len(client.calls) == 1
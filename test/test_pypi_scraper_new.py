@@ -1,3 +1,4 @@
+import json
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
@@ -27,6 +28,7 @@ async def test_get_project_metadata_success(scraper):
         mock_get.return_value = MagicMock(
             status_code=200,
             json=lambda: mock_response,
+            content=json.dumps(mock_response).encode(),
             raise_for_status=lambda: None
         )
         # Since it's an async context manager, we need to mock __aenter__
@@ -34,6 +36,7 @@ async def test_get_project_metadata_success(scraper):
         mock_get.return_value.__aenter__.return_value = MagicMock(
             status_code=200,
             json=lambda: mock_response,
+            content=json.dumps(mock_response).encode(),
             raise_for_status=lambda: None
         )
         
@@ -47,6 +50,7 @@ async def test_get_project_metadata_success(scraper):
             mock_get.return_value = MagicMock(
                 status_code=200,
                 json=lambda: mock_response,
+                content=json.dumps(mock_response).encode(),
                 raise_for_status=lambda: None
             )
             
@@ -138,3 +142,28 @@ async def test_get_release_files(scraper):
         assert isinstance(files[0], PackageFile)
         assert files[0].filename == "test-pkg-1.0.0.tar.gz"
         assert files[0].size == 1234
+        assert files[0].hashes == {"sha256": "abc"}
+        assert files[0].upload_time is None
+
+
+@pytest.mark.anyio
+async def test_get_release_files_parses_upload_time(scraper):
+    mock_metadata = {
+        "urls": [
+            {
+                "filename": "test_pkg-1.0.0-py3-none-any.whl",
+                "url": "https://files.pythonhosted.org/test_pkg-1.0.0-py3-none-any.whl",
+                "packagetype": "bdist_wheel",
+                "upload_time_iso_8601": "2024-01-02T03:04:05.123456Z",
+            },
+            {"url": "missing filename"},
+        ]
+    }
+
+    with patch.object(scraper, "get_project_metadata", return_value=mock_metadata):
+        assert await scraper.get_release_files("test-pkg") == []
+        mock_metadata["urls"].pop()
+        [wheel] = await scraper.get_release_files("test-pkg")
+
+    assert wheel.packagetype == "bdist_wheel"
+    assert wheel.upload_time.isoformat() == "2024-01-02T03:04:05.123456+00:00"